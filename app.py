@@ -372,7 +372,7 @@ def show_payment_tracking(db_manager):
         status_filter = st.selectbox("Payment Status", ["All", "Due Soon", "Overdue", "Paid"])
     
     # Get payments data
-    payments = db_manager.get_all_payments(search_term, membership_filter, status_filter)
+    payments = db_manager.add_due_dates(db_manager.get_all_payments(search_term, membership_filter, status_filter))
     
     if payments:
         # Display payments
@@ -389,9 +389,7 @@ def show_payment_tracking(db_manager):
                     st.caption(f"Paid: {payment['payment_date']}")
                 
                 with col3:
-                    # Calculate next due date
-                    next_due = db_manager.calculate_next_due_date(payment['payment_date'], payment['membership_type'])
-                    days_remaining = (next_due - datetime.now().date()).days
+                    days_remaining = payment['days_remaining']
                     
                     if days_remaining < 0:
                         st.error(f"Overdue by {abs(days_remaining)} days")
@@ -926,7 +924,7 @@ def show_member_database(db_manager):
         sort_by = st.selectbox("Sort By", ["Name", "Payment Date", "Amount", "Due Date"])
     
     # Get all members
-    members = db_manager.search_members(search_term, membership_filter, sort_by)
+    members = db_manager.add_due_dates(db_manager.search_members(search_term, membership_filter, sort_by))
     
     if members:
         st.write(f"Found {len(members)} members")
@@ -947,9 +945,7 @@ def show_member_database(db_manager):
                     st.write(f"**Payment Date:** {member['payment_date']}")
                 
                 with col2:
-                    # Calculate next due date
-                    next_due = db_manager.calculate_next_due_date(member['payment_date'], member['membership_type'])
-                    days_remaining = (next_due - datetime.now().date()).days
+                    days_remaining = member['days_remaining']
                     
                     st.write("**Payment Status:**")
                     if days_remaining < 0:
@@ -1,19 +1,127 @@
 import sqlite3
+import threading
+import time
+import queue
+import urllib.request
 import pandas as pd
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 import os
+from utils import MEMBERSHIP_DURATION_DAYS
 
 class DatabaseManager:
+    # Seconds a cached dashboard aggregate stays valid
+    READ_CACHE_TTL = 30
+    # Read-only connections shared by concurrent Streamlit sessions
+    READER_POOL_SIZE = 4
+    # Seconds to wait for a free reader before giving up, so a leaked connection
+    # surfaces as an error instead of hanging every later read
+    READER_TIMEOUT = 10
+    # Bump when init_database gains new tables, indexes, views or triggers
+    SCHEMA_VERSION = 2
+    
+    # Hot INSERT statements shared by the single-row and bulk paths so the
+    # connection's statement cache reuses one prepared statement for each
+    _INSERT_MEMBER_SQL = '''
+    INSERT INTO members (name, phone, email, membership_type, amount, payment_date, reminder_days, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+    _INSERT_PAYMENT_SQL = '''
+    INSERT INTO payment_history (member_id, amount, payment_date, payment_method, notes)
+    VALUES (?, ?, ?, ?, ?)
+    '''
+    _UPDATE_MEMBER_PAYMENT_SQL = '''
+    UPDATE members
+    SET payment_date = ?, amount = ?, updated_at = CURRENT_TIMESTAMP
+    WHERE id = ?
+    '''
+    _INSERT_REMINDER_LOG_SQL = '''
+    INSERT INTO reminder_logs (member_id, reminder_type, message, success)
+    VALUES (?, ?, ?, ?)
+    '''
+    
     def __init__(self, db_path=None):
         # Use environment variable for deployment, fallback to local for development
         self.db_path = db_path or os.getenv("DB_PATH", "badminton_court.db")
+        
+        # Single long-lived writer connection shared by all write methods (and by
+        # Streamlit sessions through st.cache_resource) instead of reopening per call
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self._read_cache = {}
+        self._fts_enabled = False
+        # Templates change rarely; cached until update_message_template clears them
+        self._template_cache = {}
+        self._configure_connection(self._conn)
         self.init_database()
+        
+        # Reads borrow from a pool of read-only connections so sessions don't
+        # queue behind each other (or behind a write) on the writer connection
+        self._readers = queue.Queue()
+        for _ in range(self.READER_POOL_SIZE):
+            self._readers.put(self._open_reader())
+    
+    def _configure_connection(self, conn):
+        """Apply performance PRAGMAs to a freshly opened connection"""
+        # WAL lets readers proceed while a write is in flight; NORMAL sync
+        # skips the fsync on every commit (still durable across app crashes)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-20000')
+        conn.execute('PRAGMA mmap_size=268435456')
+    
+    def _open_reader(self):
+        """Open a read-only connection to the database file"""
+        uri = f"file:{urllib.request.pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        self._configure_connection(conn)
+        return conn
+    
+    @contextmanager
+    def reader(self):
+        """Borrow a read-only connection from the pool for the duration of a query"""
+        try:
+            conn = self._readers.get(timeout=self.READER_TIMEOUT)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"No database reader free after {self.READER_TIMEOUT}s; all {self.READER_POOL_SIZE} are in use"
+            ) from None
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+    
+    def _get_cached(self, key):
+        """Return a cached read result, or None if missing or expired"""
+        entry = self._read_cache.get(key)
+        if entry and time.monotonic() - entry[0] < self.READ_CACHE_TTL:
+            return entry[1]
+        return None
+    
+    def _set_cached(self, key, value):
+        """Store a read result in the TTL cache and return it"""
+        self._read_cache[key] = (time.monotonic(), value)
+        return value
+    
+    def _invalidate_read_cache(self):
+        """Drop cached aggregates after a write to members or payments"""
+        self._read_cache.clear()
     
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
         
+        # Schema already at this version: skip re-running every CREATE ... IF NOT EXISTS
+        cursor.execute('PRAGMA user_version')
+        if cursor.fetchone()[0] >= self.SCHEMA_VERSION:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'members_fts'")
+            self._fts_enabled = cursor.fetchone() is not None
+            return
+        
         # Members table
         cursor.execute('''
         CREATE TABLE IF NOT EXISTS members (
@@ -130,11 +238,70 @@ class DatabaseManager:
         )
         ''')
         
+        # Indexes for foreign-key lookups and due-date scans
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ph_member ON payment_history(member_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_rl_member ON reminder_logs(member_id, reminder_type, sent_at)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ci_member ON member_checkins(member_id)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_members_paydate ON members(payment_date)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_kph_kid ON kids_payment_history(kid_id, payment_date)')
+        
+        # Full-text index over member name/phone/email for the search boxes
+        self._init_members_fts(cursor)
+        
         # Insert default message templates if they don't exist
         self._insert_default_templates(cursor)
         
+        cursor.execute(f'PRAGMA user_version = {self.SCHEMA_VERSION}')
         conn.commit()
-        conn.close()
+    
+    def _init_members_fts(self, cursor):
+        """Create the trigram FTS5 index on members and its sync triggers"""
+        try:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'members_fts'")
+            is_new = cursor.fetchone() is None
+            
+            # Trigram tokens keep LIKE '%term%' substring semantics (partial phone numbers, mid-word names)
+            cursor.execute('''
+            CREATE VIRTUAL TABLE IF NOT EXISTS members_fts USING fts5(
+                name, phone, email, content='members', content_rowid='id', tokenize='trigram'
+            )
+            ''')
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS members_fts_ai AFTER INSERT ON members BEGIN
+                INSERT INTO members_fts (rowid, name, phone, email) VALUES (new.id, new.name, new.phone, new.email);
+            END
+            ''')
+            cursor.execute('''
+            CREATE TRIGGER IF NOT EXISTS members_fts_ad AFTER DELETE ON members BEGIN
+                INSERT INTO members_fts (members_fts, rowid, name, phone, email) VALUES ('delete', old.id, old.name, old.phone, old.email);
+            END
+            ''')
+            # Only edits to the indexed columns need to touch the FTS index, not payment updates;
+            # dropped first so databases created with the old all-columns trigger pick this up
+            cursor.execute('DROP TRIGGER IF EXISTS members_fts_au')
+            cursor.execute('''
+            CREATE TRIGGER members_fts_au AFTER UPDATE OF name, phone, email ON members BEGIN
+                INSERT INTO members_fts (members_fts, rowid, name, phone, email) VALUES ('delete', old.id, old.name, old.phone, old.email);
+                INSERT INTO members_fts (rowid, name, phone, email) VALUES (new.id, new.name, new.phone, new.email);
+            END
+            ''')
+            
+            # Index members that existed before the FTS table was added
+            if is_new:
+                cursor.execute("INSERT INTO members_fts (members_fts) VALUES ('rebuild')")
+            
+            self._fts_enabled = True
+        except sqlite3.OperationalError as e:
+            # SQLite built without FTS5/trigram; searches fall back to LIKE
+            print(f"Full-text search unavailable: {e}")
+    
+    def _fts_match(self, search_term, columns):
+        """Build an FTS5 MATCH expression for a substring search, or None to use LIKE"""
+        # Trigram index can only answer terms of three or more characters
+        if not self._fts_enabled or len(search_term) < 3:
+            return None
+        phrase = '"' + search_term.replace('"', '""') + '"'
+        return f"{{{' '.join(columns)}}} : {phrase}"
     
     def _insert_default_templates(self, cursor):
         """Insert default message templates"""
@@ -159,1003 +326,1028 @@ For any queries, contact us: {phone}
 Thank you!""")
         ]
         
-        for template_type, message_text in default_templates:
-            cursor.execute('''
-            INSERT OR IGNORE INTO message_templates (template_type, message_text)
-            VALUES (?, ?)
-            ''', (template_type, message_text))
+        cursor.executemany('''
+        INSERT OR IGNORE INTO message_templates (template_type, message_text)
+        VALUES (?, ?)
+        ''', default_templates)
     
     def add_member(self, name, phone, email, membership_type, amount, payment_date, reminder_days, notes):
         """Add a new member to the database"""
-        try:
-            conn = sqlite3.connect(self.db_path)
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute(self._INSERT_MEMBER_SQL, (name, phone, email, membership_type, amount, payment_date, reminder_days, notes))
+                    
+                    member_id = cursor.lastrowid
+                    
+                    # Add initial payment to payment history
+                    cursor.execute(self._INSERT_PAYMENT_SQL, (member_id, amount, payment_date, "Initial Payment", "Membership registration"))
+                
+                self._invalidate_read_cache()
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
+    
+    def add_members_bulk(self, rows):
+        """Add many members in a single transaction.
+        
+        rows: iterable of (name, phone, email, membership_type, amount,
+        payment_date, reminder_days, notes) tuples.
+        """
+        rows = list(rows)
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.executemany(self._INSERT_MEMBER_SQL, rows)
+                    
+                    # Initial payment history, keyed back to the new rows by their unique phone
+                    cursor.executemany('''
+                    INSERT INTO payment_history (member_id, amount, payment_date, payment_method, notes)
+                    SELECT id, amount, payment_date, 'Initial Payment', 'Membership registration'
+                    FROM members WHERE phone = ?
+                    ''', [(row[1],) for row in rows])
+                
+                self._invalidate_read_cache()
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
+    
+    def get_all_payments(self, search_term="", membership_filter="All", status_filter="All"):
+        """Get all payment records with optional filtering"""
+        with self.reader() as conn:
             cursor = conn.cursor()
             
-            cursor.execute('''
-            INSERT INTO members (name, phone, email, membership_type, amount, payment_date, reminder_days, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (name, phone, email, membership_type, amount, payment_date, reminder_days, notes))
+            query = '''
+            SELECT m.id, m.name as member_name, m.phone, m.email, m.membership_type, 
+                   m.amount, m.payment_date, m.reminder_days, m.notes
+            FROM members m
+            WHERE 1=1
+            '''
+            params = []
             
-            member_id = cursor.lastrowid
+            if search_term:
+                match = self._fts_match(search_term, ("name", "phone"))
+                if match:
+                    query += " AND m.id IN (SELECT rowid FROM members_fts WHERE members_fts MATCH ?)"
+                    params.append(match)
+                else:
+                    query += " AND (m.name LIKE ? OR m.phone LIKE ?)"
+                    params.extend([f"%{search_term}%", f"%{search_term}%"])
             
-            # Add initial payment to payment history
-            cursor.execute('''
-            INSERT INTO payment_history (member_id, amount, payment_date, payment_method, notes)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (member_id, amount, payment_date, "Initial Payment", "Membership registration"))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
-    
-    def get_all_payments(self, search_term="", membership_filter="All", status_filter="All"):
-        """Get all payment records with optional filtering"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = '''
-        SELECT m.id, m.name as member_name, m.phone, m.email, m.membership_type, 
-               m.amount, m.payment_date, m.reminder_days, m.notes
-        FROM members m
-        WHERE 1=1
-        '''
-        params = []
-        
-        if search_term:
-            query += " AND (m.name LIKE ? OR m.phone LIKE ?)"
-            params.extend([f"%{search_term}%", f"%{search_term}%"])
-        
-        if membership_filter != "All":
-            query += " AND m.membership_type = ?"
-            params.append(membership_filter)
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
+            if membership_filter != "All":
+                query += " AND m.membership_type = ?"
+                params.append(membership_filter)
+            
+            cursor.execute(query, params)
+            results = [dict(row) for row in cursor]
+            
+            return results
     
     def record_payment(self, member_id, amount, payment_date, payment_method, notes):
         """Record a new payment for a member"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Add payment to history
-            cursor.execute('''
-            INSERT INTO payment_history (member_id, amount, payment_date, payment_method, notes)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (member_id, amount, payment_date, payment_method, notes))
-            
-            # Update member's last payment date and amount
-            cursor.execute('''
-            UPDATE members 
-            SET payment_date = ?, amount = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-            ''', (payment_date, amount, member_id))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    # Add payment to history
+                    cursor.execute(self._INSERT_PAYMENT_SQL, (member_id, amount, payment_date, payment_method, notes))
+                    
+                    # Update member's last payment date and amount in the same transaction
+                    cursor.execute(self._UPDATE_MEMBER_PAYMENT_SQL, (payment_date, amount, member_id))
+                
+                self._invalidate_read_cache()
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
+    
+    def record_payments_bulk(self, rows):
+        """Record many member payments in a single transaction.
+        
+        rows: iterable of (member_id, amount, payment_date, payment_method, notes) tuples.
+        """
+        rows = list(rows)
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.executemany(self._INSERT_PAYMENT_SQL, rows)
+                    
+                    cursor.executemany(
+                        self._UPDATE_MEMBER_PAYMENT_SQL,
+                        [(payment_date, amount, member_id) for member_id, amount, payment_date, _, _ in rows]
+                    )
+                
+                self._invalidate_read_cache()
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
     
     def add_kid(self, kid_name, parent_name, parent_phone, age, batch_time, monthly_fee, start_date, emergency_contact, medical_notes):
         """Add a new kid to the training program"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            INSERT INTO kids_training (kid_name, parent_name, parent_phone, age, batch_time, 
-                                     monthly_fee, start_date, emergency_contact, medical_notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (kid_name, parent_name, parent_phone, age, batch_time, monthly_fee, 
-                  start_date, emergency_contact, medical_notes))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute('''
+                    INSERT INTO kids_training (kid_name, parent_name, parent_phone, age, batch_time, 
+                                             monthly_fee, start_date, emergency_contact, medical_notes)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ''', (kid_name, parent_name, parent_phone, age, batch_time, monthly_fee, 
+                          start_date, emergency_contact, medical_notes))
+                
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
     
     def get_all_kids(self):
         """Get all kids in the training program"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT * FROM kids_training WHERE active = TRUE ORDER BY kid_name
-        ''')
-        
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
-    
-    def record_kid_payment(self, kid_id, amount, payment_date, payment_method, notes):
-        """Record a payment for a kid's training"""
-        try:
-            conn = sqlite3.connect(self.db_path)
+        with self.reader() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
-            INSERT INTO kids_payment_history (kid_id, amount, payment_date, payment_method, notes)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (kid_id, amount, payment_date, payment_method, notes))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
+            SELECT * FROM kids_training WHERE active = TRUE ORDER BY kid_name
+            ''')
+            
+            results = [dict(row) for row in cursor]
+            
+            return results
+    
+    def record_kid_payment(self, kid_id, amount, payment_date, payment_method, notes):
+        """Record a payment for a kid's training"""
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute('''
+                    INSERT INTO kids_payment_history (kid_id, amount, payment_date, payment_method, notes)
+                    VALUES (?, ?, ?, ?, ?)
+                    ''', (kid_id, amount, payment_date, payment_method, notes))
+                
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
     
     def get_last_kid_payment(self, kid_id):
         """Get the last payment record for a kid"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT * FROM kids_payment_history 
-        WHERE kid_id = ? 
-        ORDER BY payment_date DESC 
-        LIMIT 1
-        ''', (kid_id,))
-        
-        row = cursor.fetchone()
-        if row:
-            columns = [description[0] for description in cursor.description]
-            result = dict(zip(columns, row))
-        else:
-            result = None
-        
-        conn.close()
-        return result
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            SELECT * FROM kids_payment_history 
+            WHERE kid_id = ? 
+            ORDER BY payment_date DESC 
+            LIMIT 1
+            ''', (kid_id,))
+            
+            row = cursor.fetchone()
+            if row:
+                result = dict(row)
+            else:
+                result = None
+            
+            return result
     
     def get_message_template(self, template_type):
         """Get a message template by type"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT message_text FROM message_templates WHERE template_type = ?
-        ''', (template_type,))
-        
-        row = cursor.fetchone()
-        conn.close()
+        if template_type in self._template_cache:
+            return self._template_cache[template_type]
         
-        return row[0] if row else ""
-    
-    def update_message_template(self, template_type, message_text):
-        """Update a message template"""
-        try:
-            conn = sqlite3.connect(self.db_path)
+        with self.reader() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
-            UPDATE message_templates 
-            SET message_text = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE template_type = ?
-            ''', (message_text, template_type))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
+            SELECT message_text FROM message_templates WHERE template_type = ?
+            ''', (template_type,))
+            
+            row = cursor.fetchone()
+            
+            self._template_cache[template_type] = row[0] if row else ""
+            return self._template_cache[template_type]
+    
+    def update_message_template(self, template_type, message_text):
+        """Update a message template"""
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute('''
+                    UPDATE message_templates 
+                    SET message_text = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE template_type = ?
+                    ''', (message_text, template_type))
+                
+                self._template_cache.clear()
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
     
     def log_reminder(self, member_id, reminder_type, message):
         """Log a sent reminder"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            INSERT INTO reminder_logs (member_id, reminder_type, message, success)
-            VALUES (?, ?, ?, ?)
-            ''', (member_id, reminder_type, message, True))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute(self._INSERT_REMINDER_LOG_SQL, (member_id, reminder_type, message, True))
+                
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
+    
+    def log_reminders_bulk(self, rows):
+        """Log many sent reminders in a single transaction.
+        
+        rows: iterable of (member_id, reminder_type, message) tuples.
+        """
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.executemany(self._INSERT_REMINDER_LOG_SQL, [(member_id, reminder_type, message, True) for member_id, reminder_type, message in rows])
+                
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
     
     def calculate_next_due_date(self, payment_date, membership_type):
         """Calculate the next due date based on membership type"""
         if isinstance(payment_date, str):
             payment_date = datetime.strptime(payment_date, '%Y-%m-%d').date()
         
-        if membership_type == "Monthly Subscriber":
-            return payment_date + timedelta(days=30)
-        elif membership_type == "Quarterly":
-            return payment_date + timedelta(days=90)
-        elif membership_type == "Half Yearly":
-            return payment_date + timedelta(days=180)
-        elif membership_type == "Annual":
-            return payment_date + timedelta(days=365)
-        else:
-            return payment_date + timedelta(days=30)  # Default to monthly
+        # Default to monthly for unknown types
+        return payment_date + timedelta(days=MEMBERSHIP_DURATION_DAYS.get(membership_type, 30))
+    
+    def _days_remaining(self, df):
+        """Vectorized next due date and days remaining for a frame with payment_date and membership_type"""
+        payment_dates = pd.to_datetime(df['payment_date'], format='%Y-%m-%d')
+        offsets = df['membership_type'].map(MEMBERSHIP_DURATION_DAYS).fillna(30)
+        next_due = payment_dates + pd.to_timedelta(offsets, unit='D')
+        days_remaining = (next_due - pd.Timestamp(datetime.now().date())).dt.days
+        return next_due, days_remaining
+    
+    def add_due_dates(self, records):
+        """Annotate member records in place with next_due_date and days_remaining"""
+        if not records:
+            return records
+        
+        df = pd.DataFrame(records, columns=['payment_date', 'membership_type'])
+        next_due, days_remaining = self._days_remaining(df)
+        
+        for record, due, days in zip(records, next_due.dt.date, days_remaining.tolist()):
+            record['next_due_date'] = due
+            record['days_remaining'] = days
+        
+        return records
     
     def get_total_members(self):
         """Get total number of members"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT COUNT(*) FROM members')
-        count = cursor.fetchone()[0]
+        cached = self._get_cached('total_members')
+        if cached is not None:
+            return cached
         
-        conn.close()
-        return count
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COUNT(*) FROM members')
+            count = cursor.fetchone()[0]
+            
+            return self._set_cached('total_members', count)
     
     def get_active_subscriptions(self):
         """Get number of active subscriptions (not overdue)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Consider active if next payment due date is in the future
-        today = datetime.now().date()
+        cached = self._get_cached('active_subscriptions')
+        if cached is not None:
+            return cached
         
-        cursor.execute('''
-        SELECT COUNT(*) FROM members m
-        WHERE date(m.payment_date, '+30 days') >= date(?)
-        ''', (today,))
-        
-        count = cursor.fetchone()[0]
-        conn.close()
-        return count
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            # Consider active if next payment due date is in the future
+            today = datetime.now().date()
+            
+            cursor.execute('''
+            SELECT COUNT(*) FROM members m
+            WHERE date(m.payment_date, '+30 days') >= date(?)
+            ''', (today,))
+            
+            count = cursor.fetchone()[0]
+            return self._set_cached('active_subscriptions', count)
     
     def get_total_kids(self):
         """Get total number of kids in training"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT COUNT(*) FROM kids_training WHERE active = TRUE')
-        count = cursor.fetchone()[0]
-        
-        conn.close()
-        return count
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('SELECT COUNT(*) FROM kids_training WHERE active = TRUE')
+            count = cursor.fetchone()[0]
+            
+            return count
     
     def get_recent_payments(self, limit=5):
         """Get recent payments"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT m.name as member_name, ph.amount, ph.payment_date
-        FROM payment_history ph
-        JOIN members m ON ph.member_id = m.id
-        ORDER BY ph.created_at DESC
-        LIMIT ?
-        ''', (limit,))
+        cached = self._get_cached(('recent_payments', limit))
+        if cached is not None:
+            return cached
         
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+            SELECT m.name as member_name, ph.amount, ph.payment_date
+            FROM payment_history ph
+            JOIN members m ON ph.member_id = m.id
+            ORDER BY ph.created_at DESC
+            LIMIT ?
+            ''', (limit,))
+            
+            results = [dict(row) for row in cursor]
+            
+            return self._set_cached(('recent_payments', limit), results)
     
     def search_members(self, search_term="", membership_filter="All", sort_by="Name"):
         """Search and filter members"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = '''
-        SELECT * FROM members
-        WHERE 1=1
-        '''
-        params = []
-        
-        if search_term:
-            query += " AND (name LIKE ? OR phone LIKE ? OR email LIKE ?)"
-            params.extend([f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"])
-        
-        if membership_filter != "All":
-            query += " AND membership_type = ?"
-            params.append(membership_filter)
-        
-        # Add sorting
-        if sort_by == "Name":
-            query += " ORDER BY name"
-        elif sort_by == "Payment Date":
-            query += " ORDER BY payment_date DESC"
-        elif sort_by == "Amount":
-            query += " ORDER BY amount DESC"
-        elif sort_by == "Due Date":
-            query += " ORDER BY payment_date ASC"
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+            SELECT * FROM members
+            WHERE 1=1
+            '''
+            params = []
+            
+            if search_term:
+                match = self._fts_match(search_term, ("name", "phone", "email"))
+                if match:
+                    query += " AND id IN (SELECT rowid FROM members_fts WHERE members_fts MATCH ?)"
+                    params.append(match)
+                else:
+                    query += " AND (name LIKE ? OR phone LIKE ? OR email LIKE ?)"
+                    params.extend([f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"])
+            
+            if membership_filter != "All":
+                query += " AND membership_type = ?"
+                params.append(membership_filter)
+            
+            # Add sorting
+            if sort_by == "Name":
+                query += " ORDER BY name"
+            elif sort_by == "Payment Date":
+                query += " ORDER BY payment_date DESC"
+            elif sort_by == "Amount":
+                query += " ORDER BY amount DESC"
+            elif sort_by == "Due Date":
+                query += " ORDER BY payment_date ASC"
+            
+            cursor.execute(query, params)
+            results = [dict(row) for row in cursor]
+            
+            return results
     
     def update_member(self, member_id, name, phone, email, membership_type, amount, reminder_days, notes):
         """Update member information"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            UPDATE members 
-            SET name = ?, phone = ?, email = ?, membership_type = ?, 
-                amount = ?, reminder_days = ?, notes = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-            ''', (name, phone, email, membership_type, amount, reminder_days, notes, member_id))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute('''
+                    UPDATE members 
+                    SET name = ?, phone = ?, email = ?, membership_type = ?, 
+                        amount = ?, reminder_days = ?, notes = ?, updated_at = CURRENT_TIMESTAMP
+                    WHERE id = ?
+                    ''', (name, phone, email, membership_type, amount, reminder_days, notes, member_id))
+                
+                self._invalidate_read_cache()
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
     
     def delete_member(self, member_id):
         """Delete a member and their payment history"""
-        try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Delete payment history first (foreign key constraint)
-            cursor.execute('DELETE FROM payment_history WHERE member_id = ?', (member_id,))
-            cursor.execute('DELETE FROM reminder_logs WHERE member_id = ?', (member_id,))
-            cursor.execute('DELETE FROM members WHERE id = ?', (member_id,))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
-    
-    # Analytics functions
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    # Delete payment history first (foreign key constraint)
+                    cursor.execute('DELETE FROM payment_history WHERE member_id = ?', (member_id,))
+                    cursor.execute('DELETE FROM reminder_logs WHERE member_id = ?', (member_id,))
+                    cursor.execute('DELETE FROM members WHERE id = ?', (member_id,))
+                
+                self._invalidate_read_cache()
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
+        
+        # Analytics functions
     def get_revenue_analytics(self):
         """Get comprehensive revenue analytics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Total revenue from all payments
-        cursor.execute('SELECT SUM(amount) FROM payment_history')
-        total_revenue = cursor.fetchone()[0] or 0
-        
-        # Monthly revenue for current year
-        cursor.execute('''
-        SELECT strftime('%Y-%m', payment_date) as month, SUM(amount) as revenue
-        FROM payment_history 
-        WHERE payment_date >= date('now', 'start of year')
-        GROUP BY strftime('%Y-%m', payment_date)
-        ORDER BY month
-        ''')
-        monthly_revenue = [dict(zip(['month', 'revenue'], row)) for row in cursor.fetchall()]
-        
-        # Revenue by membership type
-        cursor.execute('''
-        SELECT m.membership_type, SUM(ph.amount) as revenue, COUNT(ph.id) as payments
-        FROM payment_history ph
-        JOIN members m ON ph.member_id = m.id
-        GROUP BY m.membership_type
-        ORDER BY revenue DESC
-        ''')
-        revenue_by_type = [dict(zip(['membership_type', 'revenue', 'payments'], row)) for row in cursor.fetchall()]
-        
-        # Kids training revenue
-        cursor.execute('SELECT SUM(amount) FROM kids_payment_history')
-        kids_revenue = cursor.fetchone()[0] or 0
-        
-        # This month's revenue
-        cursor.execute('''
-        SELECT SUM(amount) FROM payment_history 
-        WHERE payment_date >= date('now', 'start of month')
-        ''')
-        this_month_revenue = cursor.fetchone()[0] or 0
-        
-        # Last month's revenue for comparison
-        cursor.execute('''
-        SELECT SUM(amount) FROM payment_history 
-        WHERE payment_date >= date('now', 'start of month', '-1 month')
-        AND payment_date < date('now', 'start of month')
-        ''')
-        last_month_revenue = cursor.fetchone()[0] or 0
-        
-        conn.close()
-        
-        return {
-            'total_revenue': total_revenue,
-            'monthly_revenue': monthly_revenue,
-            'revenue_by_type': revenue_by_type,
-            'kids_revenue': kids_revenue,
-            'this_month_revenue': this_month_revenue,
-            'last_month_revenue': last_month_revenue
-        }
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            # Total revenue from all payments
+            cursor.execute('SELECT SUM(amount) FROM payment_history')
+            total_revenue = cursor.fetchone()[0] or 0
+            
+            # Monthly revenue for current year
+            cursor.execute('''
+            SELECT strftime('%Y-%m', payment_date) as month, SUM(amount) as revenue
+            FROM payment_history 
+            WHERE payment_date >= date('now', 'start of year')
+            GROUP BY strftime('%Y-%m', payment_date)
+            ORDER BY month
+            ''')
+            monthly_revenue = [dict(row) for row in cursor]
+            
+            # Revenue by membership type
+            cursor.execute('''
+            SELECT m.membership_type, SUM(ph.amount) as revenue, COUNT(ph.id) as payments
+            FROM payment_history ph
+            JOIN members m ON ph.member_id = m.id
+            GROUP BY m.membership_type
+            ORDER BY revenue DESC
+            ''')
+            revenue_by_type = [dict(row) for row in cursor]
+            
+            # Kids training revenue
+            cursor.execute('SELECT SUM(amount) FROM kids_payment_history')
+            kids_revenue = cursor.fetchone()[0] or 0
+            
+            # This month's revenue
+            cursor.execute('''
+            SELECT SUM(amount) FROM payment_history 
+            WHERE payment_date >= date('now', 'start of month')
+            ''')
+            this_month_revenue = cursor.fetchone()[0] or 0
+            
+            # Last month's revenue for comparison
+            cursor.execute('''
+            SELECT SUM(amount) FROM payment_history 
+            WHERE payment_date >= date('now', 'start of month', '-1 month')
+            AND payment_date < date('now', 'start of month')
+            ''')
+            last_month_revenue = cursor.fetchone()[0] or 0
+            
+            
+            return {
+                'total_revenue': total_revenue,
+                'monthly_revenue': monthly_revenue,
+                'revenue_by_type': revenue_by_type,
+                'kids_revenue': kids_revenue,
+                'this_month_revenue': this_month_revenue,
+                'last_month_revenue': last_month_revenue
+            }
     
     def get_membership_analytics(self):
         """Get membership analytics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Membership type distribution
-        cursor.execute('''
-        SELECT membership_type, COUNT(*) as count
-        FROM members
-        GROUP BY membership_type
-        ORDER BY count DESC
-        ''')
-        membership_distribution = [dict(zip(['membership_type', 'count'], row)) for row in cursor.fetchall()]
-        
-        # New members this month
-        cursor.execute('''
-        SELECT COUNT(*) FROM members 
-        WHERE created_at >= date('now', 'start of month')
-        ''')
-        new_members_this_month = cursor.fetchone()[0]
-        
-        # Payment status overview with proper membership type consideration
-        today = datetime.now().date()
-        
-        # Get all members and calculate their individual due dates
-        cursor.execute('''
-        SELECT id, payment_date, membership_type
-        FROM members
-        ''')
-        
-        members = cursor.fetchall()
-        overdue_count = 0
-        due_soon_count = 0
-        active_count = 0
-        
-        for member in members:
-            member_id, payment_date, membership_type = member
-            if isinstance(payment_date, str):
-                payment_date = datetime.strptime(payment_date, '%Y-%m-%d').date()
-            
-            next_due_date = self.calculate_next_due_date(payment_date, membership_type)
-            days_remaining = (next_due_date - today).days
-            
-            if days_remaining < 0:
-                overdue_count += 1
-            elif days_remaining <= 7:
-                due_soon_count += 1
-            else:
-                active_count += 1
-        
-        payment_status_data = {
-            'overdue': overdue_count,
-            'due_soon': due_soon_count, 
-            'active': active_count
-        }
-        
-        conn.close()
-        
-        return {
-            'membership_distribution': membership_distribution,
-            'new_members_this_month': new_members_this_month,
-            'payment_status': payment_status_data
-        }
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            # Membership type distribution
+            cursor.execute('''
+            SELECT membership_type, COUNT(*) as count
+            FROM members
+            GROUP BY membership_type
+            ORDER BY count DESC
+            ''')
+            membership_distribution = [dict(row) for row in cursor]
+            
+            # New members this month
+            cursor.execute('''
+            SELECT COUNT(*) FROM members 
+            WHERE created_at >= date('now', 'start of month')
+            ''')
+            new_members_this_month = cursor.fetchone()[0]
+            
+            # Payment status overview with proper membership type consideration,
+            # computing every member's due date in one vectorized pass
+            members = pd.read_sql_query('SELECT payment_date, membership_type FROM members', conn)
+            _, days_remaining = self._days_remaining(members)
+            overdue = days_remaining < 0
+            due_soon = ~overdue & (days_remaining <= 7)
+            
+            payment_status_data = {
+                'overdue': int(overdue.sum()),
+                'due_soon': int(due_soon.sum()), 
+                'active': int(len(members) - overdue.sum() - due_soon.sum())
+            }
+            
+            
+            return {
+                'membership_distribution': membership_distribution,
+                'new_members_this_month': new_members_this_month,
+                'payment_status': payment_status_data
+            }
     
     def get_kids_analytics(self):
         """Get kids training analytics"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Kids by batch time
-        cursor.execute('''
-        SELECT batch_time, COUNT(*) as count
-        FROM kids_training
-        WHERE active = TRUE
-        GROUP BY batch_time
-        ORDER BY count DESC
-        ''')
-        kids_by_batch = [dict(zip(['batch_time', 'count'], row)) for row in cursor.fetchall()]
-        
-        # Average age
-        cursor.execute('SELECT AVG(age) FROM kids_training WHERE active = TRUE')
-        avg_age = cursor.fetchone()[0] or 0
-        
-        # Age distribution
-        cursor.execute('''
-        SELECT 
-            CASE 
-                WHEN age <= 6 THEN '4-6 years'
-                WHEN age <= 8 THEN '7-8 years'
-                WHEN age <= 10 THEN '9-10 years'
-                WHEN age <= 12 THEN '11-12 years'
-                ELSE '13+ years'
-            END as age_group,
-            COUNT(*) as count
-        FROM kids_training
-        WHERE active = TRUE
-        GROUP BY age_group
-        ORDER BY age_group
-        ''')
-        age_distribution = [dict(zip(['age_group', 'count'], row)) for row in cursor.fetchall()]
-        
-        conn.close()
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            # Kids by batch time
+            cursor.execute('''
+            SELECT batch_time, COUNT(*) as count
+            FROM kids_training
+            WHERE active = TRUE
+            GROUP BY batch_time
+            ORDER BY count DESC
+            ''')
+            kids_by_batch = [dict(row) for row in cursor]
+            
+            # Average age
+            cursor.execute('SELECT AVG(age) FROM kids_training WHERE active = TRUE')
+            avg_age = cursor.fetchone()[0] or 0
+            
+            # Age distribution
+            cursor.execute('''
+            SELECT 
+                CASE 
+                    WHEN age <= 6 THEN '4-6 years'
+                    WHEN age <= 8 THEN '7-8 years'
+                    WHEN age <= 10 THEN '9-10 years'
+                    WHEN age <= 12 THEN '11-12 years'
+                    ELSE '13+ years'
+                END as age_group,
+                COUNT(*) as count
+            FROM kids_training
+            WHERE active = TRUE
+            GROUP BY age_group
+            ORDER BY age_group
+            ''')
+            age_distribution = [dict(row) for row in cursor]
+            
+            
+            return {
+                'kids_by_batch': kids_by_batch,
+                'average_age': round(avg_age, 1),
+                'age_distribution': age_distribution
+            }
         
-        return {
-            'kids_by_batch': kids_by_batch,
-            'average_age': round(avg_age, 1),
-            'age_distribution': age_distribution
-        }
-    
-    # Bulk messaging functions
+        # Bulk messaging functions
     def get_members_for_bulk_messaging(self, membership_filter="All"):
         """Get members list for bulk messaging with filtering options"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = '''
-        SELECT id, name, phone, email, membership_type
-        FROM members
-        WHERE 1=1
-        '''
-        params = []
-        
-        if membership_filter != "All":
-            query += " AND membership_type = ?"
-            params.append(membership_filter)
-        
-        query += " ORDER BY name"
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+            SELECT id, name, phone, email, membership_type
+            FROM members
+            WHERE 1=1
+            '''
+            params = []
+            
+            if membership_filter != "All":
+                query += " AND membership_type = ?"
+                params.append(membership_filter)
+            
+            query += " ORDER BY name"
+            
+            cursor.execute(query, params)
+            results = [dict(row) for row in cursor]
+            
+            return results
     
     def get_kids_parents_for_messaging(self):
         """Get kids parents list for bulk messaging"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT DISTINCT parent_name as name, parent_phone as phone, kid_name
-        FROM kids_training
-        WHERE active = TRUE
-        ORDER BY parent_name
-        ''')
-        
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
-    
-    def log_bulk_message(self, message_text, recipient_count, message_type, sent_by="System"):
-        """Log bulk message sending for record keeping"""
-        try:
-            conn = sqlite3.connect(self.db_path)
+        with self.reader() as conn:
             cursor = conn.cursor()
             
             cursor.execute('''
-            INSERT INTO bulk_messages_log (message_text, recipient_count, message_type, sent_by)
-            VALUES (?, ?, ?, ?)
-            ''', (message_text, recipient_count, message_type, sent_by))
-            
-            conn.commit()
-            conn.close()
-            return True
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False
+            SELECT DISTINCT parent_name as name, parent_phone as phone, kid_name
+            FROM kids_training
+            WHERE active = TRUE
+            ORDER BY parent_name
+            ''')
+            
+            results = [dict(row) for row in cursor]
+            
+            return results
+    
+    def log_bulk_message(self, message_text, recipient_count, message_type, sent_by="System"):
+        """Log bulk message sending for record keeping"""
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    cursor.execute('''
+                    INSERT INTO bulk_messages_log (message_text, recipient_count, message_type, sent_by)
+                    VALUES (?, ?, ?, ?)
+                    ''', (message_text, recipient_count, message_type, sent_by))
+                
+                return True
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False
     
     def get_bulk_message_history(self, limit=10):
         """Get history of bulk messages sent"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT message_text, recipient_count, message_type, sent_by, sent_at
-        FROM bulk_messages_log
-        ORDER BY sent_at DESC
-        LIMIT ?
-        ''', (limit,))
-        
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
-    
-    # Check-in functions
-    def record_member_checkin(self, member_id, member_name, phone, usage_type="General Play", notes=""):
-        """Record a member check-in"""
-        try:
-            conn = sqlite3.connect(self.db_path)
+        with self.reader() as conn:
             cursor = conn.cursor()
             
-            # Check if member already has an active check-in (no check-out)
             cursor.execute('''
-            SELECT id FROM member_checkins 
-            WHERE member_id = ? AND check_out_time IS NULL
-            ORDER BY check_in_time DESC LIMIT 1
-            ''', (member_id,))
+            SELECT message_text, recipient_count, message_type, sent_by, sent_at
+            FROM bulk_messages_log
+            ORDER BY sent_at DESC
+            LIMIT ?
+            ''', (limit,))
             
-            existing_checkin = cursor.fetchone()
-            if existing_checkin:
-                conn.close()
-                return False, "Member already checked in. Please check out first."
+            results = [dict(row) for row in cursor]
             
-            cursor.execute('''
-            INSERT INTO member_checkins (member_id, member_name, phone, court_usage_type, notes)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (member_id, member_name, phone, usage_type, notes))
-            
-            conn.commit()
-            conn.close()
-            return True, "Check-in successful"
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False, f"Database error: {e}"
+            return results
+        
+        # Check-in functions
+    def record_member_checkin(self, member_id, member_name, phone, usage_type="General Play", notes=""):
+        """Record a member check-in"""
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    # Check if member already has an active check-in (no check-out)
+                    cursor.execute('''
+                    SELECT id FROM member_checkins 
+                    WHERE member_id = ? AND check_out_time IS NULL
+                    ORDER BY check_in_time DESC LIMIT 1
+                    ''', (member_id,))
+                    
+                    existing_checkin = cursor.fetchone()
+                    if existing_checkin:
+                        return False, "Member already checked in. Please check out first."
+                    
+                    cursor.execute('''
+                    INSERT INTO member_checkins (member_id, member_name, phone, court_usage_type, notes)
+                    VALUES (?, ?, ?, ?, ?)
+                    ''', (member_id, member_name, phone, usage_type, notes))
+                
+                return True, "Check-in successful"
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False, f"Database error: {e}"
     
     def record_member_checkout(self, member_id):
         """Record a member check-out"""
-        try:
-            conn = sqlite3.connect(self.db_path)
+        with self._lock:
+            try:
+                with self._conn as conn:
+                    cursor = conn.cursor()
+                    
+                    # Find the active check-in
+                    cursor.execute('''
+                    SELECT id, check_in_time FROM member_checkins 
+                    WHERE member_id = ? AND check_out_time IS NULL
+                    ORDER BY check_in_time DESC LIMIT 1
+                    ''', (member_id,))
+                    
+                    checkin_record = cursor.fetchone()
+                    if not checkin_record:
+                        return False, "No active check-in found"
+                    
+                    checkin_id, check_in_time = checkin_record
+                    
+                    # Calculate duration
+                    check_in_dt = datetime.strptime(check_in_time, '%Y-%m-%d %H:%M:%S')
+                    check_out_dt = datetime.now()
+                    duration_minutes = int((check_out_dt - check_in_dt).total_seconds() / 60)
+                    
+                    # Update with checkout time and duration
+                    cursor.execute('''
+                    UPDATE member_checkins 
+                    SET check_out_time = CURRENT_TIMESTAMP, duration_minutes = ?
+                    WHERE id = ?
+                    ''', (duration_minutes, checkin_id))
+                
+                return True, f"Check-out successful. Duration: {duration_minutes} minutes"
+            except sqlite3.Error as e:
+                print(f"Database error: {e}")
+                return False, f"Database error: {e}"
+    
+    def get_active_checkins(self):
+        """Get all currently active check-ins"""
+        with self.reader() as conn:
             cursor = conn.cursor()
             
-            # Find the active check-in
             cursor.execute('''
-            SELECT id, check_in_time FROM member_checkins 
-            WHERE member_id = ? AND check_out_time IS NULL
-            ORDER BY check_in_time DESC LIMIT 1
-            ''', (member_id,))
-            
-            checkin_record = cursor.fetchone()
-            if not checkin_record:
-                conn.close()
-                return False, "No active check-in found"
+            SELECT id, member_id, member_name, phone, check_in_time, court_usage_type, notes
+            FROM member_checkins
+            WHERE check_out_time IS NULL
+            ORDER BY check_in_time DESC
+            ''')
             
-            checkin_id, check_in_time = checkin_record
+            results = [dict(row) for row in cursor]
             
-            # Calculate duration
-            check_in_dt = datetime.strptime(check_in_time, '%Y-%m-%d %H:%M:%S')
-            check_out_dt = datetime.now()
-            duration_minutes = int((check_out_dt - check_in_dt).total_seconds() / 60)
-            
-            # Update with checkout time and duration
-            cursor.execute('''
-            UPDATE member_checkins 
-            SET check_out_time = CURRENT_TIMESTAMP, duration_minutes = ?
-            WHERE id = ?
-            ''', (duration_minutes, checkin_id))
-            
-            conn.commit()
-            conn.close()
-            return True, f"Check-out successful. Duration: {duration_minutes} minutes"
-        except sqlite3.Error as e:
-            print(f"Database error: {e}")
-            return False, f"Database error: {e}"
-    
-    def get_active_checkins(self):
-        """Get all currently active check-ins"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-        SELECT id, member_id, member_name, phone, check_in_time, court_usage_type, notes
-        FROM member_checkins
-        WHERE check_out_time IS NULL
-        ORDER BY check_in_time DESC
-        ''')
-        
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
+            return results
     
     def get_checkin_history(self, limit=20, member_id=None):
         """Get check-in history"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = '''
-        SELECT id, member_id, member_name, phone, check_in_time, check_out_time, 
-               duration_minutes, court_usage_type, notes
-        FROM member_checkins
-        WHERE 1=1
-        '''
-        params = []
-        
-        if member_id:
-            query += " AND member_id = ?"
-            params.append(member_id)
-        
-        query += " ORDER BY check_in_time DESC LIMIT ?"
-        params.append(limit)
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        return results
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            query = '''
+            SELECT id, member_id, member_name, phone, check_in_time, check_out_time, 
+                   duration_minutes, court_usage_type, notes
+            FROM member_checkins
+            WHERE 1=1
+            '''
+            params = []
+            
+            if member_id:
+                query += " AND member_id = ?"
+                params.append(member_id)
+            
+            query += " ORDER BY check_in_time DESC LIMIT ?"
+            params.append(limit)
+            
+            cursor.execute(query, params)
+            results = [dict(row) for row in cursor]
+            
+            return results
     
     def get_checkin_analytics(self, days_back=30):
         """Get check-in analytics for the specified period"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cutoff_date = datetime.now() - timedelta(days=days_back)
-        
-        # Total visits
-        cursor.execute('''
-        SELECT COUNT(*) FROM member_checkins
-        WHERE check_in_time >= ?
-        ''', (cutoff_date,))
-        total_visits = cursor.fetchone()[0]
-        
-        # Unique visitors
-        cursor.execute('''
-        SELECT COUNT(DISTINCT member_id) FROM member_checkins
-        WHERE check_in_time >= ?
-        ''', (cutoff_date,))
-        unique_visitors = cursor.fetchone()[0]
-        
-        # Average duration
-        cursor.execute('''
-        SELECT AVG(duration_minutes) FROM member_checkins
-        WHERE check_in_time >= ? AND duration_minutes IS NOT NULL
-        ''', (cutoff_date,))
-        avg_duration = cursor.fetchone()[0] or 0
-        
-        # Peak hours
-        cursor.execute('''
-        SELECT strftime('%H', check_in_time) as hour, COUNT(*) as count
-        FROM member_checkins
-        WHERE check_in_time >= ?
-        GROUP BY hour
-        ORDER BY count DESC
-        LIMIT 5
-        ''', (cutoff_date,))
-        peak_hours = [dict(zip(['hour', 'count'], row)) for row in cursor.fetchall()]
-        
-        # Daily visits
-        cursor.execute('''
-        SELECT DATE(check_in_time) as date, COUNT(*) as visits
-        FROM member_checkins
-        WHERE check_in_time >= ?
-        GROUP BY DATE(check_in_time)
-        ORDER BY date DESC
-        LIMIT 7
-        ''', (cutoff_date,))
-        daily_visits = [dict(zip(['date', 'visits'], row)) for row in cursor.fetchall()]
-        
-        # Most frequent visitors
-        cursor.execute('''
-        SELECT member_name, COUNT(*) as visit_count
-        FROM member_checkins
-        WHERE check_in_time >= ?
-        GROUP BY member_id, member_name
-        ORDER BY visit_count DESC
-        LIMIT 5
-        ''', (cutoff_date,))
-        frequent_visitors = [dict(zip(['member_name', 'visit_count'], row)) for row in cursor.fetchall()]
-        
-        conn.close()
-        
-        return {
-            'total_visits': total_visits,
-            'unique_visitors': unique_visitors,
-            'average_duration': round(avg_duration, 1),
-            'peak_hours': peak_hours,
-            'daily_visits': daily_visits,
-            'frequent_visitors': frequent_visitors
-        }
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            cutoff_date = datetime.now() - timedelta(days=days_back)
+            
+            # Total visits
+            cursor.execute('''
+            SELECT COUNT(*) FROM member_checkins
+            WHERE check_in_time >= ?
+            ''', (cutoff_date,))
+            total_visits = cursor.fetchone()[0]
+            
+            # Unique visitors
+            cursor.execute('''
+            SELECT COUNT(DISTINCT member_id) FROM member_checkins
+            WHERE check_in_time >= ?
+            ''', (cutoff_date,))
+            unique_visitors = cursor.fetchone()[0]
+            
+            # Average duration
+            cursor.execute('''
+            SELECT AVG(duration_minutes) FROM member_checkins
+            WHERE check_in_time >= ? AND duration_minutes IS NOT NULL
+            ''', (cutoff_date,))
+            avg_duration = cursor.fetchone()[0] or 0
+            
+            # Peak hours
+            cursor.execute('''
+            SELECT strftime('%H', check_in_time) as hour, COUNT(*) as count
+            FROM member_checkins
+            WHERE check_in_time >= ?
+            GROUP BY hour
+            ORDER BY count DESC
+            LIMIT 5
+            ''', (cutoff_date,))
+            peak_hours = [dict(row) for row in cursor]
+            
+            # Daily visits
+            cursor.execute('''
+            SELECT DATE(check_in_time) as date, COUNT(*) as visits
+            FROM member_checkins
+            WHERE check_in_time >= ?
+            GROUP BY DATE(check_in_time)
+            ORDER BY date DESC
+            LIMIT 7
+            ''', (cutoff_date,))
+            daily_visits = [dict(row) for row in cursor]
+            
+            # Most frequent visitors
+            cursor.execute('''
+            SELECT member_name, COUNT(*) as visit_count
+            FROM member_checkins
+            WHERE check_in_time >= ?
+            GROUP BY member_id, member_name
+            ORDER BY visit_count DESC
+            LIMIT 5
+            ''', (cutoff_date,))
+            frequent_visitors = [dict(row) for row in cursor]
+            
+            
+            return {
+                'total_visits': total_visits,
+                'unique_visitors': unique_visitors,
+                'average_duration': round(avg_duration, 1),
+                'peak_hours': peak_hours,
+                'daily_visits': daily_visits,
+                'frequent_visitors': frequent_visitors
+            }
     
     def export_members_data(self):
         """Export all members data as DataFrame"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-        SELECT 
-            m.id,
-            m.name,
-            m.phone,
-            m.email,
-            m.membership_type,
-            m.amount,
-            m.payment_date,
-            m.reminder_days,
-            m.notes,
-            m.created_at,
-            m.updated_at,
-            CASE 
-                WHEN DATE('now') > DATE(m.payment_date, '+1 month') THEN 'Overdue'
-                WHEN DATE('now') > DATE(m.payment_date, '+' || (30 - m.reminder_days) || ' days') THEN 'Due Soon'
-                ELSE 'Active'
-            END as status
-        FROM members m
-        ORDER BY m.name
-        '''
-        
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with self.reader() as conn:
+            
+            query = '''
+            SELECT 
+                m.id,
+                m.name,
+                m.phone,
+                m.email,
+                m.membership_type,
+                m.amount,
+                m.payment_date,
+                m.reminder_days,
+                m.notes,
+                m.created_at,
+                m.updated_at,
+                CASE 
+                    WHEN DATE('now') > DATE(m.payment_date, '+1 month') THEN 'Overdue'
+                    WHEN DATE('now') > DATE(m.payment_date, '+' || (30 - m.reminder_days) || ' days') THEN 'Due Soon'
+                    ELSE 'Active'
+                END as status
+            FROM members m
+            ORDER BY m.name
+            '''
+            
+            df = pd.read_sql_query(query, conn)
+            return df
     
     def export_payment_history_data(self):
         """Export all payment history data as DataFrame"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-        SELECT 
-            ph.id,
-            m.name as member_name,
-            m.phone as member_phone,
-            ph.amount,
-            ph.payment_date,
-            ph.payment_method,
-            ph.notes,
-            ph.created_at
-        FROM payment_history ph
-        JOIN members m ON ph.member_id = m.id
-        ORDER BY ph.payment_date DESC
-        '''
-        
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with self.reader() as conn:
+            
+            query = '''
+            SELECT 
+                ph.id,
+                m.name as member_name,
+                m.phone as member_phone,
+                ph.amount,
+                ph.payment_date,
+                ph.payment_method,
+                ph.notes,
+                ph.created_at
+            FROM payment_history ph
+            JOIN members m ON ph.member_id = m.id
+            ORDER BY ph.payment_date DESC
+            '''
+            
+            df = pd.read_sql_query(query, conn)
+            return df
     
     def export_kids_training_data(self):
         """Export all kids training data as DataFrame"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-        SELECT 
-            kt.id,
-            kt.kid_name,
-            kt.parent_name,
-            kt.parent_phone,
-            kt.age,
-            kt.batch_time,
-            kt.monthly_fee,
-            kt.start_date,
-            kt.emergency_contact,
-            kt.medical_notes,
-            CASE WHEN kt.active = 1 THEN 'Active' ELSE 'Inactive' END as status,
-            kt.created_at,
-            kt.updated_at
-        FROM kids_training kt
-        ORDER BY kt.kid_name
-        '''
-        
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with self.reader() as conn:
+            
+            query = '''
+            SELECT 
+                kt.id,
+                kt.kid_name,
+                kt.parent_name,
+                kt.parent_phone,
+                kt.age,
+                kt.batch_time,
+                kt.monthly_fee,
+                kt.start_date,
+                kt.emergency_contact,
+                kt.medical_notes,
+                CASE WHEN kt.active = 1 THEN 'Active' ELSE 'Inactive' END as status,
+                kt.created_at,
+                kt.updated_at
+            FROM kids_training kt
+            ORDER BY kt.kid_name
+            '''
+            
+            df = pd.read_sql_query(query, conn)
+            return df
     
     def export_kids_payment_history_data(self):
         """Export all kids payment history data as DataFrame"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-        SELECT 
-            kph.id,
-            kt.kid_name,
-            kt.parent_name,
-            kt.parent_phone,
-            kph.amount,
-            kph.payment_date,
-            kph.payment_method,
-            kph.notes,
-            kph.created_at
-        FROM kids_payment_history kph
-        JOIN kids_training kt ON kph.kid_id = kt.id
-        ORDER BY kph.payment_date DESC
-        '''
-        
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with self.reader() as conn:
+            
+            query = '''
+            SELECT 
+                kph.id,
+                kt.kid_name,
+                kt.parent_name,
+                kt.parent_phone,
+                kph.amount,
+                kph.payment_date,
+                kph.payment_method,
+                kph.notes,
+                kph.created_at
+            FROM kids_payment_history kph
+            JOIN kids_training kt ON kph.kid_id = kt.id
+            ORDER BY kph.payment_date DESC
+            '''
+            
+            df = pd.read_sql_query(query, conn)
+            return df
     
     def export_checkin_data(self):
         """Export all check-in data as DataFrame"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-        SELECT 
-            mc.id,
-            mc.member_name,
-            mc.phone,
-            mc.check_in_time,
-            mc.check_out_time,
-            mc.duration_minutes,
-            mc.court_usage_type,
-            mc.notes,
-            CASE 
-                WHEN mc.check_out_time IS NULL THEN 'Active'
-                ELSE 'Completed'
-            END as status
-        FROM member_checkins mc
-        ORDER BY mc.check_in_time DESC
-        '''
-        
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with self.reader() as conn:
+            
+            query = '''
+            SELECT 
+                mc.id,
+                mc.member_name,
+                mc.phone,
+                mc.check_in_time,
+                mc.check_out_time,
+                mc.duration_minutes,
+                mc.court_usage_type,
+                mc.notes,
+                CASE 
+                    WHEN mc.check_out_time IS NULL THEN 'Active'
+                    ELSE 'Completed'
+                END as status
+            FROM member_checkins mc
+            ORDER BY mc.check_in_time DESC
+            '''
+            
+            df = pd.read_sql_query(query, conn)
+            return df
     
     def export_reminder_logs_data(self):
         """Export all reminder logs data as DataFrame"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-        SELECT 
-            rl.id,
-            m.name as member_name,
-            m.phone as member_phone,
-            rl.reminder_type,
-            rl.sent_date,
-            rl.next_due_date,
-            rl.message_sent,
-            rl.delivery_status,
-            rl.notes
-        FROM reminder_logs rl
-        JOIN members m ON rl.member_id = m.id
-        ORDER BY rl.sent_date DESC
-        '''
-        
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with self.reader() as conn:
+            
+            query = '''
+            SELECT 
+                rl.id,
+                m.name as member_name,
+                m.phone as member_phone,
+                rl.reminder_type,
+                rl.sent_date,
+                rl.next_due_date,
+                rl.message_sent,
+                rl.delivery_status,
+                rl.notes
+            FROM reminder_logs rl
+            JOIN members m ON rl.member_id = m.id
+            ORDER BY rl.sent_date DESC
+            '''
+            
+            df = pd.read_sql_query(query, conn)
+            return df
     
     def export_bulk_messages_data(self):
         """Export all bulk messages data as DataFrame"""
-        conn = sqlite3.connect(self.db_path)
-        
-        query = '''
-        SELECT 
-            bml.id,
-            bml.message_content,
-            bml.recipient_count,
-            bml.sent_date,
-            bml.sent_by,
-            bml.message_type,
-            bml.delivery_status
-        FROM bulk_messages_log bml
-        ORDER BY bml.sent_date DESC
-        '''
-        
-        df = pd.read_sql_query(query, conn)
-        conn.close()
-        return df
+        with self.reader() as conn:
+            
+            query = '''
+            SELECT 
+                bml.id,
+                bml.message_content,
+                bml.recipient_count,
+                bml.sent_date,
+                bml.sent_by,
+                bml.message_type,
+                bml.delivery_status
+            FROM bulk_messages_log bml
+            ORDER BY bml.sent_date DESC
+            '''
+            
+            df = pd.read_sql_query(query, conn)
+            return df
     
     def get_database_summary(self):
         """Get summary statistics for export"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        summary = {}
-        
-        # Count all tables
-        tables = ['members', 'payment_history', 'kids_training', 'kids_payment_history', 
-                 'member_checkins', 'reminder_logs', 'bulk_messages_log']
-        
-        for table in tables:
-            try:
-                cursor.execute(f'SELECT COUNT(*) FROM {table}')
-                count = cursor.fetchone()[0]
-                summary[table] = count
-            except sqlite3.OperationalError:
-                summary[table] = 0
-        
-        # Calculate date ranges
-        cursor.execute('SELECT MIN(created_at), MAX(created_at) FROM members')
-        result = cursor.fetchone()
-        if result[0]:
-            summary['date_range'] = {'start': result[0], 'end': result[1]}
-        else:
-            summary['date_range'] = {'start': 'No data', 'end': 'No data'}
-        
-        conn.close()
-        return summary
\ No newline at end of file
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            summary = {}
+            
+            # Count all tables
+            tables = ['members', 'payment_history', 'kids_training', 'kids_payment_history', 
+                     'member_checkins', 'reminder_logs', 'bulk_messages_log']
+            
+            for table in tables:
+                try:
+                    cursor.execute(f'SELECT COUNT(*) FROM {table}')
+                    count = cursor.fetchone()[0]
+                    summary[table] = count
+                except sqlite3.OperationalError:
+                    summary[table] = 0
+            
+            # Calculate date ranges
+            cursor.execute('SELECT MIN(created_at), MAX(created_at) FROM members')
+            result = cursor.fetchone()
+            if result[0]:
+                summary['date_range'] = {'start': result[0], 'end': result[1]}
+            else:
+                summary['date_range'] = {'start': 'No data', 'end': 'No data'}
+            
+            return summary
\ No newline at end of file
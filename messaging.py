@@ -1,8 +1,19 @@
 import os
+import string
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from twilio.rest import Client
-from datetime import datetime
+from datetime import datetime, timedelta
+from utils import calculate_membership_duration
+
+_FORMATTER = string.Formatter()
 
 class MessageManager:
+    # Concurrent Twilio requests for bulk sends, and the per-sender rate cap they share
+    BULK_SEND_WORKERS = 16
+    MAX_MESSAGES_PER_SECOND = 25
+    
     def __init__(self):
         self.account_sid = os.getenv("TWILIO_ACCOUNT_SID", "")
         self.auth_token = os.getenv("TWILIO_AUTH_TOKEN", "")
@@ -13,6 +24,11 @@ class MessageManager:
             self.client = Client(self.account_sid, self.auth_token)
         else:
             self.client = None
+        
+        self._rate_lock = threading.Lock()
+        self._next_send_at = 0.0
+        # Parsed templates keyed by template text, so edited templates get a fresh entry
+        self._compiled_templates = {}
     
     def send_message(self, phone, message, method="SMS"):
         """Send SMS or WhatsApp message using Twilio"""
@@ -43,6 +59,58 @@ class MessageManager:
             print(f"Failed to send message: {str(e)}")
             return False
     
+    def _wait_for_send_slot(self):
+        """Space sends out so bulk dispatch stays under the per-second cap"""
+        with self._rate_lock:
+            now = time.monotonic()
+            send_at = max(now, self._next_send_at)
+            self._next_send_at = send_at + 1.0 / self.MAX_MESSAGES_PER_SECOND
+        if send_at > now:
+            time.sleep(send_at - now)
+    
+    def _send_rate_limited(self, phone, message, method):
+        """Send one message once a rate-limit slot is available"""
+        self._wait_for_send_slot()
+        return self.send_message(phone, message, method)
+    
+    def send_bulk(self, targets, method="SMS"):
+        """Send (phone, message) pairs concurrently; returns success flags in input order"""
+        targets = list(targets)
+        if not self.client:
+            print("Twilio client not initialized. Please check your credentials.")
+            return [False] * len(targets)
+        if not targets:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(self.BULK_SEND_WORKERS, len(targets))) as executor:
+            return list(executor.map(lambda target: self._send_rate_limited(target[0], target[1], method), targets))
+    
+    def _compile_template(self, template):
+        """Parse a template into (literal, field, format_spec, conversion) parts once"""
+        if template not in self._compiled_templates:
+            parts = tuple(_FORMATTER.parse(template))
+            # Positional or dotted/indexed fields are left to str.format
+            if any(field is not None and not field.isidentifier() for _, field, _, _ in parts):
+                parts = None
+            self._compiled_templates[template] = parts
+        return self._compiled_templates[template]
+    
+    def _render_template(self, template, values):
+        """Render a template from its cached parse, matching str.format(**values)"""
+        parts = self._compile_template(template)
+        if parts is None:
+            return template.format(**values)
+        
+        pieces = []
+        for literal, field, format_spec, conversion in parts:
+            pieces.append(literal)
+            if field is not None:
+                value = _FORMATTER.convert_field(values[field], conversion)
+                if format_spec and '{' in format_spec:
+                    format_spec = _FORMATTER.vformat(format_spec, (), values)
+                pieces.append(format(value, format_spec))
+        return ''.join(pieces)
+    
     def format_message(self, template, member_data):
         """Format message template with member data"""
         # Default values for message formatting
@@ -55,16 +123,14 @@ class MessageManager:
             payment_date = datetime.strptime(payment_date, '%Y-%m-%d').date()
         
         # Calculate next due date based on membership type
-        from database import DatabaseManager
-        db = DatabaseManager()
-        due_date = db.calculate_next_due_date(payment_date, member_data.get('membership_type', 'Monthly Subscriber'))
+        due_date = payment_date + timedelta(days=calculate_membership_duration(member_data.get('membership_type', 'Monthly Subscriber')))
         
         # Calculate overdue days
         today = datetime.now().date()
         overdue_days = (today - due_date).days if today > due_date else 0
         
         # Format template with member data
-        formatted_message = template.format(
+        formatted_message = self._render_template(template, dict(
             member_name=member_data.get('member_name', 'Member'),
             amount=member_data.get('amount', 0),
             due_date=due_date.strftime('%d-%m-%Y'),
@@ -72,7 +138,7 @@ class MessageManager:
             overdue_days=overdue_days,
             court_name=court_name,
             phone=contact_phone
-        )
+        ))
         
         return formatted_message
     
@@ -80,10 +146,10 @@ class MessageManager:
         """Send bulk messages to multiple recipients"""
         results = []
         
-        for recipient in recipients:
-            formatted_message = self.format_message(message_template, recipient)
-            success = self.send_message(recipient['phone'], formatted_message, method)
-            
+        targets = [(recipient['phone'], self.format_message(message_template, recipient)) for recipient in recipients]
+        sent = self.send_bulk(targets, method)
+        
+        for recipient, success in zip(recipients, sent):
             results.append({
                 'member_id': recipient.get('member_id'),
                 'member_name': recipient.get('member_name'),
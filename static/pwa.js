@@ -0,0 +1,91 @@
+// PWA bootstrap for KJ Badminton Academy
+// Readable source of _PWA_JS_MIN in streamlit.py; re-minify with rjsmin after editing
+
+// Guard against running twice in one page (Streamlit can re-render this block)
+if (!window.__kjPwaInit) {
+    window.__kjPwaInit = true;
+
+    // The manifest is a static file, so there is no Blob or object URL to create (or leak)
+    const manifestURL = '/app/static/manifest.json';
+
+    // Replace an existing manifest link only when it points somewhere else
+    const existingManifest = document.querySelector('link[rel="manifest"]');
+    if (!existingManifest || existingManifest.getAttribute('href') !== manifestURL) {
+        if (existingManifest) {
+            existingManifest.remove();
+        }
+        const manifestLink = document.createElement('link');
+        manifestLink.rel = 'manifest';
+        manifestLink.href = manifestURL;
+        document.head.appendChild(manifestLink);
+    }
+
+    // Add PWA meta tags
+    const metaTags = [
+        {name: 'viewport', content: 'width=device-width, initial-scale=1, maximum-scale=1, user-scalable=no'},
+        {name: 'apple-mobile-web-app-capable', content: 'yes'},
+        {name: 'apple-mobile-web-app-status-bar-style', content: 'default'},
+        {name: 'apple-mobile-web-app-title', content: 'KJ Academy'},
+        {name: 'mobile-web-app-capable', content: 'yes'},
+        {name: 'theme-color', content: '#1f77b4'},
+        {name: 'apple-touch-icon', content: '/app/static/icon-192x192.png'}
+    ];
+
+    metaTags.forEach(tag => {
+        // Leave tags that already say the right thing alone, so the DOM is only touched on change
+        const existingTag = document.querySelector(`meta[name="${tag.name}"]`);
+        if (existingTag && existingTag.content === tag.content) {
+            return;
+        }
+        if (existingTag) {
+            existingTag.remove();
+        }
+        const meta = document.createElement('meta');
+        meta.name = tag.name;
+        meta.content = tag.content;
+        document.head.appendChild(meta);
+    });
+
+    // Register the service worker from its static URL, so the browser can cache and update it.
+    // Streamlit serves it under /app/static/ without a Service-Worker-Allowed header, so the
+    // root scope (the only one that covers app pages) is refused unless a proxy in front adds
+    // Service-Worker-Allowed: / to that response. Under a plain `streamlit run` no worker is
+    // installed and none of the caching in sw.js runs
+    if ('serviceWorker' in navigator) {
+        const swURL = '/app/static/sw.js?v=__APP_VERSION__';
+
+        const registerServiceWorker = function() {
+            navigator.serviceWorker.register(swURL, {scope: '/'})
+                // The app works the same without a service worker, so failures stay silent
+                .catch(function() {});
+        };
+
+        // Wait for the load event so registration stays off Streamlit's startup path;
+        // this script usually runs after load already fired, in which case go ahead now
+        if (document.readyState === 'complete') {
+            registerServiceWorker();
+        } else {
+            window.addEventListener('load', registerServiceWorker);
+        }
+    }
+
+    // Add install prompt functionality
+    let deferredPrompt;
+    window.addEventListener('beforeinstallprompt', (e) => {
+        e.preventDefault();
+        deferredPrompt = e;
+
+        // Show install button if it exists
+        const installBtn = document.getElementById('install-btn');
+        if (installBtn) {
+            installBtn.style.display = 'block';
+            installBtn.addEventListener('click', () => {
+                deferredPrompt.prompt();
+                deferredPrompt.userChoice.then((choiceResult) => {
+                    deferredPrompt = null;
+                    installBtn.style.display = 'none';
+                });
+            });
+        }
+    });
+}
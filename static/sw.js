@@ -1,45 +1,70 @@
-// Service Worker for KJ Badminton Academy PWA
-const CACHE_NAME = 'kj-badminton-v1';
+// Service worker for KJ Badminton Academy PWA
+// Served from /app/static/sw.js and registered by the bootstrap in static/pwa.js
+//
+// Only active behind a proxy that adds "Service-Worker-Allowed: /" to this file's response:
+// the bootstrap registers it with scope '/', which browsers refuse for a script under
+// /app/static/ otherwise. Streamlit on its own never sends that header, so under a plain
+// `streamlit run` this worker is not installed and nothing here runs
+
+// The registration URL carries the app version (?v=...), so each deploy gets a fresh cache
+const CACHE_NAME = 'kj-badminton-' + new URL(self.location.href).searchParams.get('v');
+
+// App shell plus the PWA's own static files; Streamlit's hashed /static/ bundles are
+// picked up lazily by the stale-while-revalidate fetch handler below
 const urlsToCache = [
-  '/',
-  '/static/manifest.json',
-  '/static/icon-192x192.png',
-  '/static/icon-512x512.png'
+    '/',
+    '/app/static/manifest.json',
+    '/app/static/icon-192x192.png',
+    '/app/static/icon-512x512.png'
 ];
 
-// Install event
 self.addEventListener('install', function(event) {
-  event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then(function(cache) {
-        return cache.addAll(urlsToCache);
-      })
-  );
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(function(cache) {
+                return cache.addAll(urlsToCache);
+            })
+    );
 });
 
-// Fetch event
+// Stale-while-revalidate: answer from cache, refresh the entry in the background
 self.addEventListener('fetch', function(event) {
-  event.respondWith(
-    caches.match(event.request)
-      .then(function(response) {
-        // Return cached version or fetch from network
-        return response || fetch(event.request);
-      }
-    )
-  );
+    // Only same-origin GETs for static content; let Streamlit's
+    // websocket, health checks and form posts go straight to the network
+    if (event.request.method !== 'GET') return;
+    const url = new URL(event.request.url);
+    if (url.origin !== location.origin) return;
+    if (url.pathname.startsWith('/_stcore/') || url.pathname.startsWith('/stream')) return;
+
+    event.respondWith(
+        caches.open(CACHE_NAME).then(function(cache) {
+            return cache.match(event.request).then(function(cached) {
+                const network = fetch(event.request)
+                    .then(function(response) {
+                        if (response.ok) {
+                            cache.put(event.request, response.clone());
+                        }
+                        return response;
+                    })
+                    .catch(function() {
+                        return cached;
+                    });
+                return cached || network;
+            });
+        })
+    );
 });
 
-// Activate event
 self.addEventListener('activate', function(event) {
-  event.waitUntil(
-    caches.keys().then(function(cacheNames) {
-      return Promise.all(
-        cacheNames.map(function(cacheName) {
-          if (cacheName !== CACHE_NAME) {
-            return caches.delete(cacheName);
-          }
+    event.waitUntil(
+        caches.keys().then(function(cacheNames) {
+            return Promise.all(
+                cacheNames.map(function(cacheName) {
+                    if (cacheName !== CACHE_NAME) {
+                        return caches.delete(cacheName);
+                    }
+                })
+            );
         })
-      );
-    })
-  );
-});
\ No newline at end of file
+    );
+});
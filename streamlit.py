@@ -2,24 +2,109 @@ import streamlit as st
 import pandas as pd
 from datetime import datetime, timedelta
 import sqlite3
+import csv
+import json
+import io
 import time
+import queue
+import threading
+from contextlib import contextmanager
+from functools import partial
 import os
-import re
+import hmac
+import hashlib
+import string
+import urllib.parse
+import urllib.request
 from twilio.rest import Client
+from utils import MEMBERSHIP_DURATION_DAYS, next_due_date_sql, _phone_digits
 
 # =============================================================================
 # DATABASE MANAGER CLASS
 # =============================================================================
 
 class DatabaseManager:
+    # Connections shared by concurrent Streamlit sessions for reads
+    READER_POOL_SIZE = 4
+    # Seconds to wait for a free reader before giving up, so a leaked connection
+    # surfaces as an error instead of hanging every later read
+    READER_TIMEOUT = 10
+    
+    # Result column names for the list queries, fixed per query so rows can be
+    # zipped into dicts without rebuilding names from cursor.description
+    _MEMBER_COLUMNS = ('id', 'name', 'phone', 'email', 'membership_type', 'amount', 'payment_date',
+                       'reminder_days', 'notes', 'created_at', 'updated_at')
+    _PAYMENT_COLUMNS = ('id', 'member_name', 'phone', 'email', 'membership_type', 'amount',
+                        'payment_date', 'reminder_days', 'notes')
+    _DUE_COLUMNS = ('next_due_date', 'days_remaining')
+    _RECENT_PAYMENT_COLUMNS = ('member_name', 'amount', 'payment_date')
+    _KID_COLUMNS = ('id', 'kid_name', 'parent_name', 'parent_phone', 'age', 'batch_time', 'monthly_fee',
+                    'start_date', 'emergency_contact', 'medical_notes', 'active', 'created_at', 'updated_at')
+    # Next due date from payment_date and membership_type, from the same MEMBERSHIP_DURATION_DAYS
+    # table as calculate_next_due_date
+    _NEXT_DUE_SQL = next_due_date_sql()
+    # Phone without '+', spaces or dashes, ready to drop into wa.me links; derived from phone
+    # in the query so rows written by the other app (database.py) are always covered
+    _PHONE_DIGITS_SQL = "replace(replace(replace(phone, '+', ''), ' ', ''), '-', '')"
+    _DUE_SELECT_SQL = f"{_NEXT_DUE_SQL} AS next_due_date, CAST(julianday({_NEXT_DUE_SQL}) - julianday(?) AS INTEGER) AS days_remaining"
+    
+    # search_members sort options -> (column, direction); id breaks ties so keyset paging is stable
+    _MEMBER_SORTS = {
+        "Name": ("name", "ASC"),
+        "Payment Date": ("payment_date", "DESC"),
+        "Amount": ("amount", "DESC")
+    }
+    
     def __init__(self, db_path=None):
         # Use environment variable for deployment, fallback to local for development
         self.db_path = db_path or os.getenv("DB_PATH", "badminton_court.db")
+        
+        # One long-lived writer connection (the app caches this manager with
+        # st.cache_resource, so it outlives reruns) instead of reopening per call
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._configure_connection(self._conn)
         self.init_database()
+        
+        # Reads borrow from a small pool of read-only connections so sessions don't
+        # queue behind each other, and a stray write can't bypass the writer lock
+        self._readers = queue.Queue()
+        for _ in range(self.READER_POOL_SIZE):
+            self._readers.put(self._open_reader())
+    
+    def _configure_connection(self, conn):
+        """Apply performance PRAGMAs to a freshly opened connection"""
+        # WAL lets readers proceed while a write is in flight; NORMAL sync
+        # skips the fsync on every commit (still durable across app crashes)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-20000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+    
+    def _open_reader(self):
+        """Open a read-only connection to the database file, as database.py's pool does"""
+        uri = f"file:{urllib.request.pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._configure_connection(conn)
+        return conn
+    
+    @contextmanager
+    def reader(self):
+        """Borrow a pooled connection for the duration of a query"""
+        try:
+            conn = self._readers.get(timeout=self.READER_TIMEOUT)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"No database reader free after {self.READER_TIMEOUT}s; all {self.READER_POOL_SIZE} are in use"
+            ) from None
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
     
     def init_database(self):
         """Initialize the database with required tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._conn
         cursor = conn.cursor()
         
         # Members table
@@ -138,11 +223,17 @@ class DatabaseManager:
         )
         ''')
         
+        # Membership-type filter plus payment-date ordering on the member/payment lists
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_members_mtype_date ON members(membership_type, payment_date DESC)')
+        
+        # Case-insensitive name indexes for the kids search box
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_kids_name ON kids_training(kid_name COLLATE NOCASE)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_kids_parent ON kids_training(parent_name COLLATE NOCASE)')
+        
         # Insert default message templates if they don't exist
         self._insert_default_templates(cursor)
         
         conn.commit()
-        conn.close()
     
     def _insert_default_templates(self, cursor):
         """Insert default message templates"""
@@ -176,78 +267,82 @@ Thank you!""")
     def add_member(self, name, phone, email, membership_type, amount, payment_date, reminder_days, notes):
         """Add a new member to the database"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-            INSERT INTO members (name, phone, email, membership_type, amount, payment_date, reminder_days, notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (name, phone, email, membership_type, amount, payment_date, reminder_days, notes))
-            
-            member_id = cursor.lastrowid
-            
-            # Add initial payment to payment history
-            cursor.execute('''
-            INSERT INTO payment_history (member_id, amount, payment_date, payment_method, notes)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (member_id, amount, payment_date, "Initial Payment", "Membership registration"))
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                
+                cursor.execute('''
+                INSERT INTO members (name, phone, email, membership_type, amount, payment_date, reminder_days, notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (name, phone, email, membership_type, amount, payment_date, reminder_days, notes))
+                
+                member_id = cursor.lastrowid
+                
+                # Add initial payment to payment history
+                cursor.execute('''
+                INSERT INTO payment_history (member_id, amount, payment_date, payment_method, notes)
+                VALUES (?, ?, ?, ?, ?)
+                ''', (member_id, amount, payment_date, "Initial Payment", "Membership registration"))
             
-            conn.commit()
-            conn.close()
             return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False
     
-    def get_all_payments(self, search_term="", membership_filter="All", status_filter="All"):
-        """Get all payment records with optional filtering"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = '''
-        SELECT m.id, m.name as member_name, m.phone, m.email, m.membership_type, 
-               m.amount, m.payment_date, m.reminder_days, m.notes
-        FROM members m
-        WHERE 1=1
-        '''
-        params = []
-        
-        if search_term:
-            query += " AND (m.name LIKE ? OR m.phone LIKE ?)"
-            params.extend([f"%{search_term}%", f"%{search_term}%"])
-        
-        if membership_filter != "All":
-            query += " AND m.membership_type = ?"
-            params.append(membership_filter)
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    def get_all_payments(self, search_term="", membership_filter="All", status_filter="All", limit=None, after=None, today=None):
+        """Get payment records with optional filtering, one keyset page at a time when limit is given"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            query = f'''
+            SELECT m.id, m.name as member_name, m.phone, m.email, m.membership_type, 
+                   m.amount, m.payment_date, m.reminder_days, m.notes, {self._DUE_SELECT_SQL}
+            FROM members m
+            WHERE 1=1
+            '''
+            params = [(today or datetime.now().date()).isoformat()]
+            
+            if search_term:
+                query += " AND (m.name LIKE ? OR m.phone LIKE ?)"
+                params.extend([f"%{search_term}%", f"%{search_term}%"])
+            
+            if membership_filter != "All":
+                query += " AND m.membership_type = ?"
+                params.append(membership_filter)
+            
+            # Keyset pagination: continue after the last row of the previous page
+            if after is not None:
+                query += " AND m.id > ?"
+                params.append(after['id'])
+            
+            query += " ORDER BY m.id"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            
+            cursor.execute(query, params)
+            results = [dict(zip(self._PAYMENT_COLUMNS + self._DUE_COLUMNS, row)) for row in cursor]
         
-        conn.close()
         return results
     
     def record_payment(self, member_id, amount, payment_date, payment_method, notes):
         """Record a new payment for a member"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Add payment to history
-            cursor.execute('''
-            INSERT INTO payment_history (member_id, amount, payment_date, payment_method, notes)
-            VALUES (?, ?, ?, ?, ?)
-            ''', (member_id, amount, payment_date, payment_method, notes))
-            
-            # Update member's last payment date and amount
-            cursor.execute('''
-            UPDATE members 
-            SET payment_date = ?, amount = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE id = ?
-            ''', (payment_date, amount, member_id))
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                
+                # Add payment to history
+                cursor.execute('''
+                INSERT INTO payment_history (member_id, amount, payment_date, payment_method, notes)
+                VALUES (?, ?, ?, ?, ?)
+                ''', (member_id, amount, payment_date, payment_method, notes))
+                
+                # Update member's last payment date and amount
+                cursor.execute('''
+                UPDATE members 
+                SET payment_date = ?, amount = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE id = ?
+                ''', (payment_date, amount, member_id))
             
-            conn.commit()
-            conn.close()
             return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
@@ -258,146 +353,198 @@ Thank you!""")
         if isinstance(payment_date, str):
             payment_date = datetime.strptime(payment_date, '%Y-%m-%d').date()
         
-        if membership_type == "Monthly Subscriber":
-            return payment_date + timedelta(days=30)
-        elif membership_type == "Quarterly":
-            return payment_date + timedelta(days=90)
-        elif membership_type == "Half Yearly":
-            return payment_date + timedelta(days=180)
-        elif membership_type == "Annual":
-            return payment_date + timedelta(days=365)
-        else:
-            return payment_date + timedelta(days=30)  # Default to monthly
+        # Unknown membership types default to monthly
+        return payment_date + timedelta(days=MEMBERSHIP_DURATION_DAYS.get(membership_type, 30))
     
     def get_total_members(self):
         """Get total number of members"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM members')
-        count = cursor.fetchone()[0]
-        conn.close()
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM members')
+            count = cursor.fetchone()[0]
         return count
     
     def get_active_subscriptions(self):
         """Get number of active subscriptions (not overdue)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        today = datetime.now().date()
-        cursor.execute('''
-        SELECT COUNT(*) FROM members m
-        WHERE date(m.payment_date, '+30 days') >= date(?)
-        ''', (today,))
-        count = cursor.fetchone()[0]
-        conn.close()
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            today = datetime.now().date()
+            cursor.execute('''
+            SELECT COUNT(*) FROM members m
+            WHERE date(m.payment_date, '+30 days') >= date(?)
+            ''', (today,))
+            count = cursor.fetchone()[0]
         return count
     
     def get_total_kids(self):
         """Get total number of kids in training"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('SELECT COUNT(*) FROM kids_training WHERE active = TRUE')
-        count = cursor.fetchone()[0]
-        conn.close()
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM kids_training WHERE active = TRUE')
+            count = cursor.fetchone()[0]
         return count
     
+    def get_counts_json(self):
+        """Get all dashboard counts as a dict, built by SQLite as one JSON object"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            today = datetime.now().date()
+            cursor.execute('''
+            SELECT json_object(
+                'members', (SELECT COUNT(*) FROM members),
+                'active_subscriptions', (SELECT COUNT(*) FROM members m WHERE date(m.payment_date, '+30 days') >= date(?)),
+                'kids', (SELECT COUNT(*) FROM kids_training WHERE active = TRUE)
+            )
+            ''', (today,))
+            counts = json.loads(cursor.fetchone()[0])
+        return counts
+    
     def get_recent_payments(self, limit=5):
         """Get recent payments"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-        SELECT m.name as member_name, ph.amount, ph.payment_date
-        FROM payment_history ph
-        JOIN members m ON ph.member_id = m.id
-        ORDER BY ph.created_at DESC
-        LIMIT ?
-        ''', (limit,))
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        conn.close()
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT m.name as member_name, ph.amount, ph.payment_date
+            FROM payment_history ph
+            JOIN members m ON ph.member_id = m.id
+            ORDER BY ph.created_at DESC
+            LIMIT ?
+            ''', (limit,))
+            results = [dict(zip(self._RECENT_PAYMENT_COLUMNS, row)) for row in cursor]
         return results
     
     def add_kid(self, kid_name, parent_name, parent_phone, age, batch_time, monthly_fee, start_date, emergency_contact, medical_notes):
         """Add a new kid to the training program"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-            INSERT INTO kids_training (kid_name, parent_name, parent_phone, age, batch_time, 
-                                     monthly_fee, start_date, emergency_contact, medical_notes)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (kid_name, parent_name, parent_phone, age, batch_time, monthly_fee, 
-                  start_date, emergency_contact, medical_notes))
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                INSERT INTO kids_training (kid_name, parent_name, parent_phone, age, batch_time, 
+                                         monthly_fee, start_date, emergency_contact, medical_notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (kid_name, parent_name, parent_phone, age, batch_time, monthly_fee, 
+                      start_date, emergency_contact, medical_notes))
             return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
             return False
     
-    def get_all_kids(self):
+    def get_all_kids(self, limit=None, after=None):
         """Get all kids in the training program"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-        SELECT * FROM kids_training WHERE active = TRUE ORDER BY kid_name
-        ''')
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        conn.close()
+        return self.search_kids("", limit=limit, after=after)
+    
+    def search_kids(self, search_term="", limit=None, after=None):
+        """Search active kids whose name or parent's name starts with the search term"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            query = f"SELECT {', '.join(self._KID_COLUMNS)} FROM kids_training WHERE active = TRUE"
+            params = []
+            
+            if search_term:
+                # Prefix match so SQLite can range-scan the NOCASE indexes; escape LIKE wildcards in user input
+                pattern = search_term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+                query += " AND (kid_name LIKE ? ESCAPE '\\' OR parent_name LIKE ? ESCAPE '\\')"
+                params.extend([pattern, pattern])
+            
+            # Keyset pagination on (kid_name, id)
+            if after is not None:
+                query += " AND (kid_name, id) > (?, ?)"
+                params.extend([after['kid_name'], after['id']])
+            
+            query += " ORDER BY kid_name, id"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            
+            cursor.execute(query, params)
+            results = [dict(zip(self._KID_COLUMNS, row)) for row in cursor]
         return results
     
-    def search_members(self, search_term="", membership_filter="All", sort_by="Name"):
-        """Search and filter members"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        query = 'SELECT * FROM members WHERE 1=1'
-        params = []
-        
-        if search_term:
-            query += " AND (name LIKE ? OR phone LIKE ? OR email LIKE ?)"
-            params.extend([f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"])
-        
-        if membership_filter != "All":
-            query += " AND membership_type = ?"
-            params.append(membership_filter)
-        
-        if sort_by == "Name":
-            query += " ORDER BY name"
-        elif sort_by == "Payment Date":
-            query += " ORDER BY payment_date DESC"
-        elif sort_by == "Amount":
-            query += " ORDER BY amount DESC"
-        
-        cursor.execute(query, params)
-        columns = [description[0] for description in cursor.description]
-        results = [dict(zip(columns, row)) for row in cursor.fetchall()]
-        conn.close()
+    def export_kids_training_data(self):
+        """Export active kids as a DataFrame built straight from the cursor"""
+        with self.reader() as conn:
+            df = pd.read_sql_query(f'''
+            SELECT {', '.join(self._KID_COLUMNS)} FROM kids_training WHERE active = TRUE ORDER BY kid_name
+            ''', conn)
+        return df
+    
+    def search_members(self, search_term="", membership_filter="All", sort_by="Name", limit=None, after=None, today=None):
+        """Search and filter members, one keyset page at a time when limit is given"""
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            
+            query = f"SELECT {', '.join(self._MEMBER_COLUMNS)}, {self._DUE_SELECT_SQL} FROM members WHERE 1=1"
+            params = [(today or datetime.now().date()).isoformat()]
+            
+            if search_term:
+                query += " AND (name LIKE ? OR phone LIKE ? OR email LIKE ?)"
+                params.extend([f"%{search_term}%", f"%{search_term}%", f"%{search_term}%"])
+            
+            if membership_filter != "All":
+                query += " AND membership_type = ?"
+                params.append(membership_filter)
+            
+            # Keyset pagination: continue after the last row of the previous page
+            # in the chosen sort order, with id as the tie-breaker
+            sort_column, direction = self._MEMBER_SORTS.get(sort_by, ("id", "ASC"))
+            if after is not None:
+                comparison = ">" if direction == "ASC" else "<"
+                query += f" AND ({sort_column}, id) {comparison} (?, ?)"
+                params.extend([after[sort_column], after['id']])
+            
+            query += f" ORDER BY {sort_column} {direction}, id {direction}"
+            if limit is not None:
+                query += " LIMIT ?"
+                params.append(limit)
+            
+            cursor.execute(query, params)
+            results = [dict(zip(self._MEMBER_COLUMNS + self._DUE_COLUMNS, row)) for row in cursor]
         return results
     
+    def iter_members(self, batch_size=500):
+        """Yield every member row (with next due date and days remaining), ordered by name"""
+        # Keyset batches on (name, id): the reader goes back to the pool after each batch,
+        # so a caller that stops early never keeps a pooled connection checked out
+        today = datetime.now().date().isoformat()
+        after = None
+        while True:
+            query = f"SELECT {', '.join(self._MEMBER_COLUMNS)}, {self._DUE_SELECT_SQL} FROM members"
+            params = [today]
+            if after is not None:
+                query += " WHERE (name, id) > (?, ?)"
+                params.extend(after)
+            query += " ORDER BY name, id LIMIT ?"
+            params.append(batch_size)
+            
+            with self.reader() as conn:
+                rows = conn.execute(query, params).fetchall()
+            yield from rows
+            
+            if len(rows) < batch_size:
+                return
+            after = (rows[-1][1], rows[-1][0])
+    
     def get_message_template(self, template_type):
         """Get a message template by type"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-        SELECT message_text FROM message_templates WHERE template_type = ?
-        ''', (template_type,))
-        row = cursor.fetchone()
-        conn.close()
+        with self.reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+            SELECT message_text FROM message_templates WHERE template_type = ?
+            ''', (template_type,))
+            row = cursor.fetchone()
         return row[0] if row else ""
     
     def update_message_template(self, template_type, message_text):
         """Update a message template"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-            UPDATE message_templates 
-            SET message_text = ?, updated_at = CURRENT_TIMESTAMP
-            WHERE template_type = ?
-            ''', (message_text, template_type))
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                UPDATE message_templates 
+                SET message_text = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE template_type = ?
+                ''', (message_text, template_type))
             return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
@@ -406,14 +553,12 @@ Thank you!""")
     def log_reminder(self, member_id, reminder_type, message):
         """Log a sent reminder"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute('''
-            INSERT INTO reminder_logs (member_id, reminder_type, message, success)
-            VALUES (?, ?, ?, ?)
-            ''', (member_id, reminder_type, message, True))
-            conn.commit()
-            conn.close()
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                cursor.execute('''
+                INSERT INTO reminder_logs (member_id, reminder_type, message, success)
+                VALUES (?, ?, ?, ?)
+                ''', (member_id, reminder_type, message, True))
             return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
@@ -422,23 +567,21 @@ Thank you!""")
     def delete_member(self, member_id):
         """Delete a member and all related records"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Delete related payment history first
-            cursor.execute('DELETE FROM payment_history WHERE member_id = ?', (member_id,))
-            
-            # Delete related reminder logs
-            cursor.execute('DELETE FROM reminder_logs WHERE member_id = ?', (member_id,))
-            
-            # Delete related checkin records
-            cursor.execute('DELETE FROM member_checkins WHERE member_id = ?', (member_id,))
-            
-            # Finally delete the member
-            cursor.execute('DELETE FROM members WHERE id = ?', (member_id,))
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                
+                # Delete related payment history first
+                cursor.execute('DELETE FROM payment_history WHERE member_id = ?', (member_id,))
+                
+                # Delete related reminder logs
+                cursor.execute('DELETE FROM reminder_logs WHERE member_id = ?', (member_id,))
+                
+                # Delete related checkin records
+                cursor.execute('DELETE FROM member_checkins WHERE member_id = ?', (member_id,))
+                
+                # Finally delete the member
+                cursor.execute('DELETE FROM members WHERE id = ?', (member_id,))
             
-            conn.commit()
-            conn.close()
             return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
@@ -447,17 +590,15 @@ Thank you!""")
     def delete_kid(self, kid_id):
         """Delete a kid and all related records"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Delete related payment history first
-            cursor.execute('DELETE FROM kids_payment_history WHERE kid_id = ?', (kid_id,))
-            
-            # Finally delete the kid
-            cursor.execute('DELETE FROM kids_training WHERE id = ?', (kid_id,))
+            with self._lock, self._conn as conn:
+                cursor = conn.cursor()
+                
+                # Delete related payment history first
+                cursor.execute('DELETE FROM kids_payment_history WHERE kid_id = ?', (kid_id,))
+                
+                # Finally delete the kid
+                cursor.execute('DELETE FROM kids_training WHERE id = ?', (kid_id,))
             
-            conn.commit()
-            conn.close()
             return True
         except sqlite3.Error as e:
             print(f"Database error: {e}")
@@ -467,6 +608,8 @@ Thank you!""")
 # MESSAGE MANAGER CLASS
 # =============================================================================
 
+_FORMATTER = string.Formatter()
+
 class MessageManager:
     def __init__(self):
         self.account_sid = os.getenv("TWILIO_ACCOUNT_SID", "")
@@ -478,43 +621,76 @@ class MessageManager:
             self.client = Client(self.account_sid, self.auth_token)
         else:
             self.client = None
+        
+        # Template text -> parsed parts with the literal text already URL-encoded
+        self._quoted_templates = {}
     
     def send_whatsapp_url(self, phone, message):
         """Generate WhatsApp URL for manual sending"""
         # Format phone number for WhatsApp URL
         formatted_phone = phone.replace("+", "").replace(" ", "").replace("-", "")
         # URL encode the message
-        import urllib.parse
         encoded_message = urllib.parse.quote(message)
         whatsapp_url = f"https://wa.me/{formatted_phone}?text={encoded_message}"
         return whatsapp_url
     
-    def format_message(self, template, member_data):
+    def whatsapp_urls(self, phones, message):
+        """Generate WhatsApp URLs for a Series of phone numbers sharing one message"""
+        # The message is the same for everyone, so it is encoded only once
+        encoded_message = urllib.parse.quote(message)
+        formatted_phones = phones.str.replace(r'[+ \-]', '', regex=True)
+        return 'https://wa.me/' + formatted_phones + '?text=' + encoded_message
+    
+    def _quote_template(self, template):
+        """Parse a template once into (quoted literal, field, format_spec, conversion) parts"""
+        if template not in self._quoted_templates:
+            parts = [(urllib.parse.quote(literal), field, format_spec, conversion)
+                     for literal, field, format_spec, conversion in _FORMATTER.parse(template)]
+            # Positional, dotted/indexed or nested fields are left to str.format
+            if any(field is not None and (not field.isidentifier() or '{' in format_spec)
+                   for _, field, format_spec, _ in parts):
+                parts = None
+            self._quoted_templates[template] = parts
+        return self._quoted_templates[template]
+    
+    def reminder_whatsapp_url(self, phone_digits, template, member_data, today=None):
+        """Generate the WhatsApp URL for a formatted reminder, quoting only the member-specific values"""
+        parts = self._quote_template(template)
+        if parts is None:
+            return self.send_whatsapp_url(phone_digits, self.format_message(template, member_data, today))
+        
+        values = self._message_values(member_data, today)
+        pieces = []
+        for quoted_literal, field, format_spec, conversion in parts:
+            pieces.append(quoted_literal)
+            if field is not None:
+                value = _FORMATTER.convert_field(values[field], conversion)
+                pieces.append(urllib.parse.quote(format(value, format_spec)))
+        
+        # Phone comes pre-stripped by the reminder query (DatabaseManager._PHONE_DIGITS_SQL)
+        return f"https://wa.me/{phone_digits}?text={''.join(pieces)}"
+    
+    def format_message(self, template, member_data, today=None):
         """Format message template with member data"""
+        return template.format(**self._message_values(member_data, today))
+    
+    def _message_values(self, member_data, today=None):
+        """Template variables for one member (pass today when formatting many)"""
         court_name = "KJ Badminton Academy"
         contact_phone = "+91-9876543210"
+        today = today or datetime.now().date()
         
-        payment_date = member_data.get('payment_date', datetime.now().date())
+        payment_date = member_data.get('payment_date', today)
         if isinstance(payment_date, str):
             payment_date = datetime.strptime(payment_date, '%Y-%m-%d').date()
         
         # Calculate due date
         membership_type = member_data.get('membership_type', 'Monthly Subscriber')
-        if membership_type == "Monthly Subscriber":
-            due_date = payment_date + timedelta(days=30)
-        elif membership_type == "Quarterly":
-            due_date = payment_date + timedelta(days=90)
-        elif membership_type == "Half Yearly":
-            due_date = payment_date + timedelta(days=180)
-        elif membership_type == "Annual":
-            due_date = payment_date + timedelta(days=365)
-        else:
-            due_date = payment_date + timedelta(days=30)
+        due_date = payment_date + timedelta(days=MEMBERSHIP_DURATION_DAYS.get(membership_type, 30))
         
-        today = datetime.now().date()
         overdue_days = (today - due_date).days if today > due_date else 0
         
-        formatted_message = template.format(
+        return dict(
             member_name=member_data.get('member_name', 'Member'),
             amount=member_data.get('amount', 0),
             due_date=due_date.strftime('%d-%m-%Y'),
@@ -523,8 +699,6 @@ class MessageManager:
             court_name=court_name,
             phone=contact_phone
         )
-        
-        return formatted_message
 
 # =============================================================================
 # REMINDER SCHEDULER CLASS
@@ -534,66 +708,71 @@ class ReminderScheduler:
     def __init__(self):
         pass
     
-    def get_pending_reminders(self, db_manager):
-        """Get list of members who need payment reminders"""
-        conn = sqlite3.connect(db_manager.db_path)
-        cursor = conn.cursor()
-        
-        today = datetime.now().date()
-        pending_reminders = []
-        
-        cursor.execute('''
-        SELECT id, name, phone, email, membership_type, amount, payment_date, reminder_days
-        FROM members
-        ORDER BY name
-        ''')
-        
-        members = cursor.fetchall()
-        
-        for member in members:
-            member_id, name, phone, email, membership_type, amount, payment_date, reminder_days = member
-            
-            if isinstance(payment_date, str):
-                payment_date = datetime.strptime(payment_date, '%Y-%m-%d').date()
-            
-            next_due_date = db_manager.calculate_next_due_date(payment_date, membership_type)
-            days_remaining = (next_due_date - today).days
+    def get_pending_reminders(self, db_manager, overdue=None):
+        """Get list of members who need payment reminders (only overdue or only due soon when overdue is given)"""
+        with db_manager.reader() as conn:
+            cursor = conn.cursor()
             
-            should_remind = False
-            reminder_type = "payment_reminder"
+            query = f'''
+            SELECT * FROM (
+                SELECT id, name, phone, {db_manager._PHONE_DIGITS_SQL} AS phone_digits, email, membership_type, amount, payment_date, reminder_days,
+                       {db_manager._DUE_SELECT_SQL}
+                FROM members
+            )
+            WHERE (days_remaining < 0 OR days_remaining <= reminder_days)
+            '''
+            if overdue is True:
+                query += " AND days_remaining < 0"
+            elif overdue is False:
+                query += " AND days_remaining >= 0"
+            query += " ORDER BY name, id"
             
-            if days_remaining < 0:
-                should_remind = True
-                reminder_type = "overdue_reminder"
-            elif days_remaining <= reminder_days:
-                should_remind = True
-                reminder_type = "payment_reminder"
+            cursor.execute(query, (datetime.now().date().isoformat(),))
             
-            if should_remind:
+            pending_reminders = []
+            for member in cursor:
+                (member_id, name, phone, phone_digits, email, membership_type, amount, payment_date, reminder_days,
+                 next_due_date, days_remaining) = member
+                
                 pending_reminders.append({
                     'member_id': member_id,
                     'member_name': name,
                     'phone': phone,
+                    'phone_digits': phone_digits,
                     'email': email,
                     'membership_type': membership_type,
                     'amount': amount,
-                    'payment_date': payment_date,
-                    'next_due_date': next_due_date,
+                    'payment_date': datetime.strptime(payment_date, '%Y-%m-%d').date(),
+                    'next_due_date': datetime.strptime(next_due_date, '%Y-%m-%d').date(),
                     'days_remaining': days_remaining,
-                    'reminder_type': reminder_type,
+                    'reminder_type': "overdue_reminder" if days_remaining < 0 else "payment_reminder",
                     'reminder_days': reminder_days
                 })
         
-        conn.close()
         return pending_reminders
+    
+    def get_overdue_reminders(self, db_manager):
+        """Get pending reminders for members whose payment is already overdue"""
+        return self.get_pending_reminders(db_manager, overdue=True)
+    
+    def get_due_soon_reminders(self, db_manager):
+        """Get pending reminders for members whose payment falls due within their reminder window"""
+        return self.get_pending_reminders(db_manager, overdue=False)
 
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+def _is_formatted_indian_number(phone):
+    """True for numbers already in +91XXXXXXXXXX form, the common case"""
+    return len(phone) == 13 and phone.startswith('+91') and phone[1:].isdecimal()
+
 def format_phone_number(phone):
     """Format phone number to international format"""
-    phone = re.sub(r'\D', '', phone)
+    if _is_formatted_indian_number(phone):
+        return phone
+    
+    phone = _phone_digits(phone)
     
     if phone.startswith('91') and len(phone) == 12:
         return f"+{phone}"
@@ -608,7 +787,10 @@ def format_phone_number(phone):
 
 def validate_phone_number(phone):
     """Validate phone number format"""
-    digits_only = re.sub(r'\D', '', phone)
+    if _is_formatted_indian_number(phone):
+        return True
+    
+    digits_only = _phone_digits(phone)
     
     if len(digits_only) == 10:
         return True
@@ -638,6 +820,162 @@ def init_message_manager():
 def init_reminder_scheduler():
     return ReminderScheduler()
 
+def queue_toast(message, balloons=False):
+    """Queue a toast for the next rerun instead of sleeping before st.rerun() so it stays visible"""
+    st.session_state.setdefault('queued_toasts', []).append((message, balloons))
+
+def show_queued_toasts():
+    """Show toasts queued by the previous run"""
+    for message, balloons in st.session_state.pop('queued_toasts', []):
+        st.toast(message)
+        if balloons:
+            st.balloons()
+
+# Dashboard aggregates, cached across reruns (leading underscore: DatabaseManager is not hashed)
+@st.cache_data(ttl=60)
+def _dashboard_stats(_db):
+    return _db.get_counts_json()
+
+@st.cache_data(ttl=30)
+def _recent_payments(_db, n):
+    return _db.get_recent_payments(n)
+
+# List pages keyed by filters and cursor; member rows change slowly, payment status more often
+@st.cache_data(ttl=300)
+def _member_page(_db, search_term, membership_filter, sort_by, limit=None, after=None, today=None):
+    return _db.search_members(search_term, membership_filter, sort_by, limit=limit, after=after, today=today)
+
+@st.cache_data(ttl=60)
+def _payment_page(_db, search_term, membership_filter, status_filter, limit=None, after=None, today=None):
+    return _db.get_all_payments(search_term, membership_filter, status_filter, limit=limit, after=after, today=today)
+
+# Rows per page for the payment, member and kids lists
+PAGE_SIZE = 20
+
+def fetch_page(state_key, filters, fetch):
+    """Fetch one keyset page of a list, starting over at page one when its filters change"""
+    pager = st.session_state.get(state_key)
+    if pager is None or pager['filters'] != filters:
+        pager = st.session_state[state_key] = {'filters': filters, 'cursors': [None]}
+    
+    # One extra row tells us whether there is a next page
+    rows = fetch(limit=PAGE_SIZE + 1, after=pager['cursors'][-1])
+    return rows[:PAGE_SIZE], len(rows) > PAGE_SIZE
+
+def show_page_controls(state_key, rows, has_next):
+    """Previous/Next buttons that walk the keyset cursors kept in session state"""
+    cursors = st.session_state[state_key]['cursors']
+    if len(cursors) == 1 and not has_next:
+        return
+    
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if len(cursors) > 1 and st.button("◀ Previous", key=f"{state_key}_prev"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(cursors)}")
+    with col3:
+        if has_next and st.button("Next ▶", key=f"{state_key}_next"):
+            cursors.append(rows[-1])
+            st.rerun()
+
+def due_status(days_remaining):
+    """Short due/overdue label for a days-remaining count"""
+    if days_remaining < 0:
+        return f"Overdue by {abs(days_remaining)} days"
+    return f"Due in {days_remaining} days"
+
+def _due_color(days_remaining):
+    # Same red/yellow/green bands the per-row st.error/st.warning/st.success boxes used
+    if days_remaining < 0:
+        return 'background-color: #f8d7da; color: #721c24'
+    elif days_remaining <= 7:
+        return 'background-color: #fff3cd; color: #856404'
+    return 'background-color: #d4edda; color: #155724'
+
+def show_rows_table(state_key, df, days=None):
+    """Render one page of rows as a single dataframe and return the position of the selected row, if any"""
+    styled = df.style
+    if days is not None:
+        styled = styled.apply(lambda _: [_due_color(d) for d in days], subset=['Status'])
+    
+    # Keyed by page so a selection does not carry over to a different page
+    event = st.dataframe(
+        styled,
+        hide_index=True,
+        on_select="rerun",
+        selection_mode="single-row",
+        key=f"{state_key}_table_{len(st.session_state[state_key]['cursors'])}"
+    )
+    selected = event.selection.rows
+    return selected[0] if selected and selected[0] < len(df) else None
+
+def show_delete_confirmation(kind, delete):
+    """Confirm the deletion held in the single pending_delete slot, if it is for this kind of record"""
+    pending = st.session_state.get('pending_delete')
+    if not pending or pending[0] != kind:
+        return
+    _, record_id, name = pending
+    
+    st.error(f"⚠️ **Confirm Deletion of {name}**")
+    st.warning(f"This will permanently delete the {kind} and all their payment history. This action cannot be undone.")
+    
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        if st.button("✅ Yes, Delete", key=f"confirm_yes_{kind}", type="primary"):
+            if delete(record_id):
+                invalidate_data_caches()
+                queue_toast(f"✅ {name} deleted successfully!")
+                # Clear confirmation state
+                st.session_state.pending_delete = None
+                st.rerun()
+            else:
+                st.error(f"❌ Failed to delete {kind}")
+    
+    with col2:
+        if st.button("❌ Cancel", key=f"confirm_no_{kind}"):
+            st.session_state.pending_delete = None
+            st.rerun()
+
+# Pending reminders split into (overdue, due soon), cached for a few minutes
+@st.cache_data(ttl=300)
+def _reminder_partitions(_scheduler, _db):
+    return _scheduler.get_overdue_reminders(_db), _scheduler.get_due_soon_reminders(_db)
+
+# Reminder templates only change on the Message Settings page, which clears this
+@st.cache_data(ttl=3600)
+def _message_template(_db, template_type):
+    return _db.get_message_template(template_type)
+
+def invalidate_data_caches():
+    """Drop cached dashboard figures, list pages and reminder lists after members, kids or payments change"""
+    _dashboard_stats.clear()
+    _recent_payments.clear()
+    _member_page.clear()
+    _payment_page.clear()
+    _reminder_partitions.clear()
+    # Forces this session's reminder snapshot to be rebuilt on the next read
+    st.session_state.reminders_version = st.session_state.get('reminders_version', 0) + 1
+
+# Seconds a session keeps its pending reminders snapshot before re-reading it
+REMINDERS_SNAPSHOT_TTL = 60
+
+def get_reminders_snapshot(reminder_scheduler, db_manager):
+    """Pending reminders kept in session state across reruns: (overdue, due_soon, all sorted by name)"""
+    version = st.session_state.get('reminders_version', 0)
+    cached = st.session_state.get('reminders_cache')
+    if cached is None or cached['version'] != version or time.monotonic() - cached['at'] > REMINDERS_SNAPSHOT_TTL:
+        overdue, due_soon = _reminder_partitions(reminder_scheduler, db_manager)
+        cached = st.session_state.reminders_cache = {
+            'version': version,
+            'at': time.monotonic(),
+            'overdue': overdue,
+            'due_soon': due_soon,
+            'pending': sorted(overdue + due_soon, key=lambda r: (r['member_name'], r['member_id']))
+        }
+    return cached['overdue'], cached['due_soon'], cached['pending']
+
 def show_dashboard(db_manager, reminder_scheduler):
     st.header("📊 Dashboard")
     
@@ -651,22 +989,20 @@ def show_dashboard(db_manager, reminder_scheduler):
     """, unsafe_allow_html=True)
     
     # Get statistics
-    total_members = db_manager.get_total_members()
-    active_subscriptions = db_manager.get_active_subscriptions()
-    pending_reminders = reminder_scheduler.get_pending_reminders(db_manager)
-    total_kids = db_manager.get_total_kids()
+    stats = _dashboard_stats(db_manager)
+    _, _, pending_reminders = get_reminders_snapshot(reminder_scheduler, db_manager)
     
     # Display metrics in columns
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("Total Members", total_members)
+        st.metric("Total Members", stats['members'])
     with col2:
-        st.metric("Active Subscriptions", active_subscriptions)
+        st.metric("Active Subscriptions", stats['active_subscriptions'])
     with col3:
         st.metric("Pending Reminders", len(pending_reminders))
     with col4:
-        st.metric("Kids Enrolled", total_kids)
+        st.metric("Kids Enrolled", stats['kids'])
     
     st.markdown("---")
     
@@ -688,7 +1024,7 @@ def show_dashboard(db_manager, reminder_scheduler):
     
     with col2:
         st.subheader("💰 Recent Payments")
-        recent_payments = db_manager.get_recent_payments(5)
+        recent_payments = _recent_payments(db_manager, 5)
         if recent_payments:
             for payment in recent_payments:
                 st.write(f"✅ **{payment['member_name']}** - ₹{payment['amount']} ({payment['payment_date']})")
@@ -705,7 +1041,7 @@ def show_member_registration(db_manager):
             name = st.text_input("Full Name *", placeholder="Enter member's full name")
             phone = st.text_input("Phone Number *", placeholder="+91XXXXXXXXXX")
             email = st.text_input("Email", placeholder="member@email.com")
-            
+        
         with col2:
             membership_type = st.selectbox(
                 "Membership Type *",
@@ -744,15 +1080,15 @@ def show_member_registration(db_manager):
                 )
                 
                 if success:
-                    st.success(f"✅ Member {name} registered successfully!")
-                    st.balloons()
-                    time.sleep(1)
+                    invalidate_data_caches()
+                    queue_toast(f"✅ Member {name} registered successfully!", balloons=True)
                     st.rerun()
                 else:
                     st.error("❌ Failed to register member. Please try again.")
 
 def show_payment_tracking(db_manager):
     st.header("💳 Payment Tracking")
+    today = datetime.now().date()
     
     # Search and filter options
     col1, col2, col3 = st.columns(3)
@@ -765,46 +1101,38 @@ def show_payment_tracking(db_manager):
     with col3:
         status_filter = st.selectbox("Payment Status", ["All", "Due Soon", "Overdue", "Paid"])
     
-    # Get payments data
-    payments = db_manager.get_all_payments(search_term, membership_filter, status_filter)
+    # Get one page of payments data
+    payments, has_next = fetch_page(
+        "payments_pager",
+        (search_term, membership_filter, status_filter),
+        partial(_payment_page, db_manager, search_term, membership_filter, status_filter, today=today)
+    )
     
     if payments:
-        # Display payments
-        for payment in payments:
-            with st.container():
-                col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
-                
-                with col1:
-                    st.write(f"**{payment['member_name']}**")
-                    st.caption(f"📞 {payment['phone']} | {payment['membership_type']}")
-                
-                with col2:
-                    st.write(f"₹{payment['amount']}")
-                    st.caption(f"Paid: {payment['payment_date']}")
-                
-                with col3:
-                    # Calculate next due date
-                    next_due = db_manager.calculate_next_due_date(payment['payment_date'], payment['membership_type'])
-                    days_remaining = (next_due - datetime.now().date()).days
-                    
-                    if days_remaining < 0:
-                        st.error(f"Overdue by {abs(days_remaining)} days")
-                    elif days_remaining <= 7:
-                        st.warning(f"Due in {days_remaining} days")
-                    else:
-                        st.success(f"Due in {days_remaining} days")
-                
-                with col4:
-                    if st.button("💰", key=f"pay_{payment['id']}", help="Record Payment"):
-                        st.session_state[f"show_payment_modal_{payment['id']}"] = True
-                
-                st.markdown("---")
-                
-                # Show payment modal if requested
-                if st.session_state.get(f"show_payment_modal_{payment['id']}", False):
-                    show_payment_modal(db_manager, payment)
+        # Display payments as one table; select a row to record a payment
+        df = pd.DataFrame({
+            'Name': [p['member_name'] for p in payments],
+            'Phone': [p['phone'] for p in payments],
+            'Type': [p['membership_type'] for p in payments],
+            'Amount (₹)': [p['amount'] for p in payments],
+            'Paid': [p['payment_date'] for p in payments],
+            'Next Due': [p['next_due_date'] for p in payments],
+            'Status': [due_status(p['days_remaining']) for p in payments]
+        })
+        selected = show_rows_table("payments_pager", df, [p['days_remaining'] for p in payments])
+        
+        if selected is not None:
+            payment = payments[selected]
+            if st.button(f"💰 Record Payment for {payment['member_name']}", key=f"pay_{payment['id']}"):
+                st.session_state.payment_modal = payment
+        
+        # Show the payment modal if requested
+        if st.session_state.get('payment_modal'):
+            show_payment_modal(db_manager, st.session_state.payment_modal)
     else:
         st.info("No payment records found")
+    
+    show_page_controls("payments_pager", payments, has_next)
 
 def show_payment_modal(db_manager, member):
     """Show payment recording modal"""
@@ -812,7 +1140,7 @@ def show_payment_modal(db_manager, member):
         col1, col2 = st.columns([4, 1])
         with col2:
             if st.button("✖", key=f"close_modal_{member['id']}", help="Close"):
-                st.session_state[f"show_payment_modal_{member['id']}"] = False
+                st.session_state.payment_modal = None
                 st.rerun()
         
         with st.form(f"payment_{member['id']}"):
@@ -838,17 +1166,17 @@ def show_payment_modal(db_manager, member):
                     )
                     
                     if success:
-                        st.success("✅ Payment recorded successfully!")
+                        invalidate_data_caches()
+                        queue_toast("✅ Payment recorded successfully!")
                         # Clear modal state
-                        st.session_state[f"show_payment_modal_{member['id']}"] = False
-                        time.sleep(2)
+                        st.session_state.payment_modal = None
                         st.rerun()
                     else:
                         st.error("❌ Failed to record payment")
             
             with col2:
                 if st.form_submit_button("Cancel", use_container_width=True):
-                    st.session_state[f"show_payment_modal_{member['id']}"] = False
+                    st.session_state.payment_modal = None
                     st.rerun()
 
 def show_kids_training(db_manager):
@@ -864,7 +1192,7 @@ def show_kids_training(db_manager):
                 kid_name = st.text_input("Kid's Name *", placeholder="Enter kid's name")
                 parent_name = st.text_input("Parent's Name *", placeholder="Enter parent's name")
                 parent_phone = st.text_input("Parent's Phone *", placeholder="+91XXXXXXXXXX")
-                
+            
             with col2:
                 age = st.number_input("Age", min_value=4, max_value=18, value=8)
                 batch_time = st.selectbox("Batch Time", 
@@ -896,92 +1224,60 @@ def show_kids_training(db_manager):
                     )
                     
                     if success:
-                        st.success(f"✅ {kid_name} registered successfully!")
-                        st.balloons()
-                        time.sleep(1)
+                        invalidate_data_caches()
+                        queue_toast(f"✅ {kid_name} registered successfully!", balloons=True)
                         st.rerun()
                     else:
                         st.error("❌ Failed to register kid")
     
     with tab2:
-        kids_data = db_manager.get_all_kids()
+        search_kid = st.text_input("🔍 Search Kids", placeholder="Enter kid's name or parent's name")
+        kids_data, has_next = fetch_page("kids_pager", (search_kid,), partial(db_manager.search_kids, search_kid))
         
         if kids_data:
-            search_kid = st.text_input("🔍 Search Kids", placeholder="Enter kid's name or parent's name")
+            # Display kids as one table; select a row to delete it
+            df = pd.DataFrame({
+                'Kid': [k['kid_name'] for k in kids_data],
+                'Age': [k['age'] for k in kids_data],
+                'Parent': [k['parent_name'] for k in kids_data],
+                'Phone': [k['parent_phone'] for k in kids_data],
+                'Batch': [k['batch_time'] for k in kids_data],
+                'Fee (₹/month)': [k['monthly_fee'] for k in kids_data],
+                'Started': [k['start_date'] for k in kids_data]
+            })
+            selected = show_rows_table("kids_pager", df)
             
-            if search_kid:
-                kids_data = [kid for kid in kids_data if 
-                           search_kid.lower() in kid['kid_name'].lower() or 
-                           search_kid.lower() in kid['parent_name'].lower()]
+            if selected is not None:
+                kid = kids_data[selected]
+                if st.button(f"🗑️ Delete {kid['kid_name']}", key=f"delete_kid_{kid['id']}"):
+                    st.session_state.pending_delete = ('kid', kid['id'], kid['kid_name'])
             
-            for kid in kids_data:
-                with st.container():
-                    col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 1, 1])
-                    
-                    with col1:
-                        st.write(f"**{kid['kid_name']}** (Age: {kid['age']})")
-                        st.caption(f"Parent: {kid['parent_name']}")
-                    
-                    with col2:
-                        st.write(f"📞 {kid['parent_phone']}")
-                        st.caption(f"Batch: {kid['batch_time']}")
-                    
-                    with col3:
-                        st.write(f"₹{kid['monthly_fee']}/month")
-                        st.caption(f"Started: {kid['start_date']}")
-                    
-                    with col4:
-                        st.write("🟢 Active")
-                    
-                    with col5:
-                        if st.button("🗑️", key=f"delete_kid_{kid['id']}", help="Delete Kid"):
-                            st.session_state[f"confirm_delete_kid_{kid['id']}"] = True
-                    
-                    # Show confirmation dialog if delete was clicked
-                    if st.session_state.get(f"confirm_delete_kid_{kid['id']}", False):
-                        st.error(f"⚠️ **Confirm Deletion of {kid['kid_name']}**")
-                        st.warning("This will permanently delete the kid and all their payment history. This action cannot be undone.")
-                        
-                        col1, col2, col3 = st.columns([1, 1, 2])
-                        with col1:
-                            if st.button("✅ Yes, Delete", key=f"confirm_yes_kid_{kid['id']}", type="primary"):
-                                if db_manager.delete_kid(kid['id']):
-                                    st.success(f"✅ {kid['kid_name']} deleted successfully!")
-                                    # Clear confirmation state
-                                    st.session_state[f"confirm_delete_kid_{kid['id']}"] = False
-                                    time.sleep(1)
-                                    st.rerun()
-                                else:
-                                    st.error("❌ Failed to delete kid")
-                        
-                        with col2:
-                            if st.button("❌ Cancel", key=f"confirm_no_kid_{kid['id']}"):
-                                st.session_state[f"confirm_delete_kid_{kid['id']}"] = False
-                                st.rerun()
-                    
-                    st.markdown("---")
+            show_delete_confirmation('kid', db_manager.delete_kid)
+        elif search_kid:
+            st.info("No kids found matching your search")
         else:
             st.info("No kids registered yet")
+        
+        show_page_controls("kids_pager", kids_data, has_next)
 
-def show_send_reminders(db_manager, message_manager):
+def show_send_reminders(db_manager, message_manager, reminder_scheduler):
     st.header("📱 Send Payment Reminders")
+    today = datetime.now().date()
     
-    pending_reminders = ReminderScheduler().get_pending_reminders(db_manager)
+    # Overdue and due-soon lists come back already partitioned by SQL
+    overdue, due_soon, _ = get_reminders_snapshot(reminder_scheduler, db_manager)
     
-    if not pending_reminders:
+    if not overdue and not due_soon:
         st.success("🎉 All members are up to date with their payments!")
         return
     
-    st.write(f"**{len(pending_reminders)} members** need payment reminders:")
-    
-    # Categorize reminders
-    overdue = [r for r in pending_reminders if r['days_remaining'] < 0]
-    due_soon = [r for r in pending_reminders if r['days_remaining'] >= 0]
+    st.write(f"**{len(overdue) + len(due_soon)} members** need payment reminders:")
     
     tab1, tab2 = st.tabs([f"🔴 Overdue ({len(overdue)})", f"🟡 Due Soon ({len(due_soon)})"])
     
     with tab1:
         if overdue:
+            template = _message_template(db_manager, "overdue_reminder")
             st.error(f"**{len(overdue)} members have overdue payments**")
             
             for reminder in overdue:
@@ -997,9 +1293,7 @@ def show_send_reminders(db_manager, message_manager):
                         st.caption(f"Overdue by {abs(reminder['days_remaining'])} days")
                     
                     with col3:
-                        template = db_manager.get_message_template("overdue_reminder")
-                        message = message_manager.format_message(template, reminder)
-                        whatsapp_url = message_manager.send_whatsapp_url(reminder['phone'], message)
+                        whatsapp_url = message_manager.reminder_whatsapp_url(reminder['phone_digits'], template, reminder, today)
                         
                         st.markdown(f"[📱 Send WhatsApp]({whatsapp_url})", unsafe_allow_html=True)
                     
@@ -1009,6 +1303,7 @@ def show_send_reminders(db_manager, message_manager):
     
     with tab2:
         if due_soon:
+            template = _message_template(db_manager, "payment_reminder")
             st.warning(f"**{len(due_soon)} members have payments due soon**")
             
             for reminder in due_soon:
@@ -1024,9 +1319,7 @@ def show_send_reminders(db_manager, message_manager):
                         st.caption(f"Due in {reminder['days_remaining']} days")
                     
                     with col3:
-                        template = db_manager.get_message_template("payment_reminder")
-                        message = message_manager.format_message(template, reminder)
-                        whatsapp_url = message_manager.send_whatsapp_url(reminder['phone'], message)
+                        whatsapp_url = message_manager.reminder_whatsapp_url(reminder['phone_digits'], template, reminder, today)
                         
                         st.markdown(f"[📱 Send WhatsApp]({whatsapp_url})", unsafe_allow_html=True)
                     
@@ -1058,9 +1351,16 @@ def show_bulk_messaging(db_manager, message_manager):
                 if members:
                     st.success(f"Generated WhatsApp links for {len(members)} members:")
                     
-                    for member in members:
-                        whatsapp_url = message_manager.send_whatsapp_url(member['phone'], final_message)
-                        st.markdown(f"**{member['name']}**: [📱 Send WhatsApp]({whatsapp_url})")
+                    df = pd.DataFrame(members, columns=['name', 'phone'])
+                    df['whatsapp'] = message_manager.whatsapp_urls(df['phone'], final_message)
+                    st.dataframe(
+                        df[['name', 'whatsapp']],
+                        hide_index=True,
+                        column_config={
+                            'name': st.column_config.TextColumn("Member"),
+                            'whatsapp': st.column_config.LinkColumn("WhatsApp", display_text="📱 Send WhatsApp")
+                        }
+                    )
                 else:
                     st.error("No members found")
             else:
@@ -1068,6 +1368,7 @@ def show_bulk_messaging(db_manager, message_manager):
 
 def show_member_database(db_manager):
     st.header("👥 Member Database")
+    today = datetime.now().date()
     
     # Search and filter options
     col1, col2, col3 = st.columns(3)
@@ -1080,75 +1381,39 @@ def show_member_database(db_manager):
     with col3:
         sort_by = st.selectbox("Sort By", ["Name", "Payment Date", "Amount", "Due Date"])
     
-    # Get filtered members
-    members = db_manager.search_members(search_term, membership_filter, sort_by)
+    # Get one page of filtered members
+    members, has_next = fetch_page(
+        "members_pager",
+        (search_term, membership_filter, sort_by),
+        partial(_member_page, db_manager, search_term, membership_filter, sort_by, today=today)
+    )
     
     if members:
-        st.write(f"**{len(members)} members found**")
-        
-        # Display members in a table-like format
-        for member in members:
-            with st.container():
-                col1, col2, col3, col4, col5 = st.columns([3, 2, 2, 1, 1])
-                
-                with col1:
-                    st.write(f"**{member['name']}**")
-                    st.caption(f"📞 {member['phone']}")
-                    if member['email']:
-                        st.caption(f"✉️ {member['email']}")
-                
-                with col2:
-                    st.write(f"**{member['membership_type']}**")
-                    st.caption(f"₹{member['amount']}")
-                
-                with col3:
-                    next_due = db_manager.calculate_next_due_date(member['payment_date'], member['membership_type'])
-                    days_remaining = (next_due - datetime.now().date()).days
-                    
-                    if days_remaining < 0:
-                        st.error(f"Overdue by {abs(days_remaining)} days")
-                    elif days_remaining <= 7:
-                        st.warning(f"Due in {days_remaining} days")
-                    else:
-                        st.success(f"Due in {days_remaining} days")
-                    
-                    st.caption(f"Last paid: {member['payment_date']}")
-                
-                with col4:
-                    st.write("🟢 Active")
-                
-                with col5:
-                    if st.button("🗑️", key=f"delete_btn_{member['id']}", help="Delete Member"):
-                        st.session_state[f"confirm_delete_{member['id']}"] = True
-                
-                # Show confirmation dialog if delete was clicked
-                if st.session_state.get(f"confirm_delete_{member['id']}", False):
-                    st.error(f"⚠️ **Confirm Deletion of {member['name']}**")
-                    st.warning("This will permanently delete the member and all their payment history. This action cannot be undone.")
-                    
-                    col1, col2, col3 = st.columns([1, 1, 2])
-                    with col1:
-                        if st.button("✅ Yes, Delete", key=f"confirm_yes_{member['id']}", type="primary"):
-                            if db_manager.delete_member(member['id']):
-                                st.success(f"✅ {member['name']} deleted successfully!")
-                                # Clear confirmation state
-                                st.session_state[f"confirm_delete_{member['id']}"] = False
-                                time.sleep(1)
-                                st.rerun()
-                            else:
-                                st.error("❌ Failed to delete member")
-                    
-                    with col2:
-                        if st.button("❌ Cancel", key=f"confirm_no_{member['id']}"):
-                            st.session_state[f"confirm_delete_{member['id']}"] = False
-                            st.rerun()
-                
-                if member['notes']:
-                    st.caption(f"📝 {member['notes']}")
-                
-                st.markdown("---")
+        st.write(f"**Showing {len(members)} members**")
+        
+        # Display members as one table; select a row to delete it
+        df = pd.DataFrame({
+            'Name': [m['name'] for m in members],
+            'Phone': [m['phone'] for m in members],
+            'Email': [m['email'] or '' for m in members],
+            'Type': [m['membership_type'] for m in members],
+            'Amount (₹)': [m['amount'] for m in members],
+            'Last Paid': [m['payment_date'] for m in members],
+            'Status': [due_status(m['days_remaining']) for m in members],
+            'Notes': [m['notes'] or '' for m in members]
+        })
+        selected = show_rows_table("members_pager", df, [m['days_remaining'] for m in members])
+        
+        if selected is not None:
+            member = members[selected]
+            if st.button(f"🗑️ Delete {member['name']}", key=f"delete_btn_{member['id']}"):
+                st.session_state.pending_delete = ('member', member['id'], member['name'])
+        
+        show_delete_confirmation('member', db_manager.delete_member)
     else:
         st.info("No members found matching your search criteria")
+    
+    show_page_controls("members_pager", members, has_next)
 
 def show_message_settings(db_manager):
     st.header("⚙️ Message Settings")
@@ -1158,7 +1423,7 @@ def show_message_settings(db_manager):
     
     with tab1:
         st.subheader("💬 Payment Reminder Message")
-        current_template = db_manager.get_message_template("payment_reminder")
+        current_template = _message_template(db_manager, "payment_reminder")
         
         updated_template = st.text_area(
             "Payment Reminder Template",
@@ -1169,6 +1434,7 @@ def show_message_settings(db_manager):
         
         if st.button("Update Payment Reminder", use_container_width=True):
             if db_manager.update_message_template("payment_reminder", updated_template):
+                _message_template.clear()
                 st.success("✅ Payment reminder template updated!")
                 st.rerun()
             else:
@@ -1176,7 +1442,7 @@ def show_message_settings(db_manager):
     
     with tab2:
         st.subheader("🚨 Overdue Reminder Message")
-        current_template = db_manager.get_message_template("overdue_reminder")
+        current_template = _message_template(db_manager, "overdue_reminder")
         
         updated_template = st.text_area(
             "Overdue Reminder Template",
@@ -1187,26 +1453,37 @@ def show_message_settings(db_manager):
         
         if st.button("Update Overdue Reminder", use_container_width=True):
             if db_manager.update_message_template("overdue_reminder", updated_template):
+                _message_template.clear()
                 st.success("✅ Overdue reminder template updated!")
                 st.rerun()
             else:
                 st.error("❌ Failed to update template")
 
+def stream_members_csv(db_manager):
+    """Write members to CSV one row at a time, without building a DataFrame first"""
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator="\n")
+    writer.writerow(db_manager._MEMBER_COLUMNS + db_manager._DUE_COLUMNS)
+    rows = 0
+    for row in db_manager.iter_members():
+        writer.writerow(row)
+        rows += 1
+    return buf.getvalue() if rows else None
+
 def show_data_export(db_manager):
     st.header("📊 Data Export")
+    export_date = datetime.now().strftime('%Y%m%d')
     
     col1, col2 = st.columns(2)
     
     with col1:
         if st.button("📥 Export Members Data", use_container_width=True):
-            members = db_manager.search_members()
-            if members:
-                df = pd.DataFrame(members)
-                csv = df.to_csv(index=False)
+            csv_data = stream_members_csv(db_manager)
+            if csv_data:
                 st.download_button(
                     "📁 Download Members CSV",
-                    csv,
-                    f"members_data_{datetime.now().strftime('%Y%m%d')}.csv",
+                    csv_data,
+                    f"members_data_{export_date}.csv",
                     "text/csv"
                 )
             else:
@@ -1214,14 +1491,13 @@ def show_data_export(db_manager):
     
     with col2:
         if st.button("📥 Export Kids Data", use_container_width=True):
-            kids = db_manager.get_all_kids()
-            if kids:
-                df = pd.DataFrame(kids)
-                csv = df.to_csv(index=False)
+            df = db_manager.export_kids_training_data()
+            if not df.empty:
+                csv_data = df.to_csv(index=False)
                 st.download_button(
                     "📁 Download Kids CSV",
-                    csv,
-                    f"kids_data_{datetime.now().strftime('%Y%m%d')}.csv",
+                    csv_data,
+                    f"kids_data_{export_date}.csv",
                     "text/csv"
                 )
             else:
@@ -1231,6 +1507,20 @@ def show_data_export(db_manager):
 # AUTHENTICATION FUNCTIONS
 # =============================================================================
 
+def verify_admin_credentials(username, password):
+    """Check login credentials in constant time against the configured username and password hash"""
+    admin_username = os.getenv("ADMIN_USERNAME", "admin")
+    # Prefer a SHA-256 hex digest at rest; fall back to hashing the legacy plaintext setting
+    admin_password_hash = os.getenv("ADMIN_PASSWORD_SHA256") or hashlib.sha256(
+        os.getenv("ADMIN_PASSWORD", "kjbadminton2024").encode()
+    ).hexdigest()
+    
+    password_hash = hashlib.sha256(password.encode()).hexdigest()
+    # Evaluate both comparisons so timing does not reveal which one failed
+    username_ok = hmac.compare_digest(username.encode(), admin_username.encode())
+    password_ok = hmac.compare_digest(password_hash, admin_password_hash.lower())
+    return username_ok & password_ok
+
 def show_login():
     """Show login page"""
     
@@ -1332,16 +1622,12 @@ def show_login():
         submitted = st.form_submit_button("🔐 Login", use_container_width=True)
         
         if submitted:
-            # Get credentials from environment variables for security
-            admin_username = os.getenv("ADMIN_USERNAME", "admin")
-            admin_password = os.getenv("ADMIN_PASSWORD", "kjbadminton2024")
-            
-            if username == admin_username and password == admin_password:
+            # Credentials come from environment variables for security
+            if verify_admin_credentials(username, password):
                 st.session_state.authenticated = True
                 st.session_state.username = username
                 st.session_state.login_time = datetime.now()
-                st.success("✅ Login successful! Redirecting...")
-                time.sleep(1)
+                queue_toast("✅ Login successful!")
                 st.rerun()
             else:
                 st.error("❌ Invalid username or password")
@@ -1383,177 +1669,29 @@ def logout():
     st.rerun()
 
 # =============================================================================
-# MAIN APPLICATION
+# PWA AND MOBILE STYLES
 # =============================================================================
 
-def main():
-    # Configure page ONCE at the very start - Streamlit requirement
-    st.set_page_config(
-        page_title="KJ Badminton Academy",
-        page_icon="🏸",
-        layout="wide",
-        initial_sidebar_state="expanded"
-    )
-    
-    # Initialize session state defaults to ensure fresh sessions start unauthenticated
-    st.session_state.setdefault("authenticated", False)
-    st.session_state.setdefault("login_time", None)
-    st.session_state.setdefault("username", None)
-    
-    # Check authentication after page config
-    if not check_authentication():
-        show_login()
-        return
-    
-    # Initialize managers
-    db_manager = init_database()
-    message_manager = init_message_manager()
-    reminder_scheduler = init_reminder_scheduler()
-    
-    # PWA Configuration and Meta Tags
-    st.markdown("""
-    <script>
-    // Create manifest dynamically
-    const manifest = {
-        "name": "KJ Badminton Academy",
-        "short_name": "KJ Academy",
-        "description": "Badminton court management system for KJ Badminton Academy",
-        "start_url": window.location.origin,
-        "display": "standalone",
-        "background_color": "#ffffff",
-        "theme_color": "#1f77b4",
-        "orientation": "portrait-primary",
-        "scope": "/",
-        "icons": [
-            {
-                "src": "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAMAAAADACAYAAABS3GwHAAAABHNCSVQICAgIfAhkiAAAAAlwSFlzAAALEgAACxIB0t1+/AAAADl0RVh0U29mdHdhcmUAbWF0cGxvdGxpYiB2ZXJzaW9uIDMuMC4zLCBodHRwOi8vbWF0cGxvdGxpYi5vcmcvnQurowAAACBjSFJNAAB6JgAAgIQAAPoAAACA6AAAdTAAAOpgAAA6mAAAF3CculE8AAAABmJLR0QA/wD/AP+gvaeTAAAT9dToZjPc9YOhu3VmF9uZvn9/diesdAI0v8iBFmY2o2NGmCuhfxqmT3OHT2ttMjLaMCONXQGg9H4UVFlePXlQ/GSInc0FtUAibuP0LbixcMDTil0IHELI9QjSu1CqqmSke7hBAixm8+l8DW9BSXnOFajB3mdm0TlOfStwiJNL+d6owdNsiy74mKDNOY2vcmO0fmdMlE+ni0qpSNDoZhyZax7uHEWhLGtXwOj9+k+6Zh6clBsRZJP9UwLtRAVM7l44SjT2smvbnptS2JI482zn5zcyrmcZ6oXbDVYzWy+XbhMjV975XZlL7COZR9d2xUJPdeM5hJlI1KKnlD5nJVnKD1YwZ+f6bQIeel4WEJlV7H0H0TtgWRxD8w+fws2j3x8hVR3k5VJlEioai9jqC2OeCdbFFSaJmrCZ6aT20vVZE6gJk69UUd39cugkUaTVxG5I3AK/8WsxbUdkBsPhyPMxPBOD4YANU0cghvnh9XZP1rRUbSH2Td/YkbPQLOqkivoXkD26iFxLGoZJ0HXcBfO8I9hl0U5Qk15oRpuYDszJ6ZeRwFx9fWLFG8nP5gMOX6yvnQxinG40y36Cj5Uh/dfSb+TCsLZN9ddaXdZWhSfbMc1Mm5AcOPIrFtJG35hTYWJy9Ua5cac+yw6tWSdLN2IQhuzsXMMeCUKdarKnirA3VDox6jm9SFs/p0LB9Y0g7Eufyfj3oatEUcCWwppn1qIeJAo4MU9M0EN8Z/7CzFoRE0xCM2idauLw6IJbqEOxjyDcR6kvOkRAhAk3Qp33WHQqcaomKJkynbKp7WXJYuEUprCwssyq9pJcpbRAHqgaUWVn9vFpwRnFX1Ykh1lymXjiNFTiE2KjJlP8FmQkVbeY/VzpBm0vuA41AGyMBkBBdTMGRH5mI16m8zdS0Xd1aExfZbzKs0SHM0LP2l9fPDmkYdYNxmFjwzwCNRPJEQSB4FHr1GcAq847gn5IZgoQb1/aG775+7/5iz95+/on4DcDeMG++Izv/vC3//DCl5Mvsy8kkL3EnuxU9c/B89UZ39vbmyIaFQFIMG+PUFLKVUSP48+K6SxGlnxZo3nzbRy6hYdoKmsWxVsX9+mNILNscQGAITAOJuhtDneVotZecKZjWBwWdvgBPBc8MosOCAc8VzENtllhRWGjity3nREH8ErrkrrWVldLLrdHcgLhbIJ3n6T+QG1iU3FGtvOr3Q9dbYZhIPyRcEYpdpkV7c07WNuUfpfoi5LW1pq5YHKvXVkLZABJe9D3pZYWPZpK43FWjnsXwPWza0I+1Zaus7bgwestS4nEu4hye0uhuj6PMcoVVK17PM/JFuTnnBvrrF3PyEa/UEL1ptT2+TRxKH3i4MPx13JvjzHkD8thD41tg//DGzthY/tYmJMvDixdd62ksxDGSqTsCk2Pe6Bt0NIOPM46DSIMTXDDumPyhRVSwvQVGu33BR6xyuJ0C3VbS8f62aAhFW2xXH1vtnWfKEUWt6nqr1N010aILjHN/dETCR5JAEAU66CMZIQQzU4jtV0bKPLrgl56KBd4mQz2uHaA+P0GvXZhOMLjWe4wmfc1Rp+YMJBpjfBOsh0yLI4bLgZG/u46EtE7p2oGAHadPtEZR/xhzvneUXpo6NTBUlv8HvqRnJfEiZNUZ42s0xXDmW1/Y1oV4dzxqb+INeYulfoBkc...",
-                "sizes": "192x192",
-                "type": "image/png"
-            },
-            {
-                "src": "data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAgAAAAIACAYAAAD0eNT6AAAABHNCSVQICAgIfAhkiAAAAAlwSFlzAAALEgAACxIB0t1+/AAAADl0RVh0U29mdHdhcmUAbWF0cGxvdGxpYiB2ZXJzaW9uIDMuMC4zLCBodHRwOi8vbWF0cGxvdGxpYi5vcmcvnQurowAAACBjSFJNAAB6JgAAgIQAAPoAAACA6AAAdTAAAOpgAAA6mAAAF3CculE8AAAABmJLR0QA/wD/AP+gvaeTAAAT9dToZjPc9YOhu3VmF9uZvn9/diesdAI0v8iBFmY2o2NGmCuhfxqmT3OHT2ttMjLaMCONXQGg9H4UVFlePXlQ/GSInc0FtUAibuP0LbixcMDTil0IHELI9QjSu1CqqmSke7hBAixm8+l8DW9BSXnOFajB3mdm0TlOfStwiJNL+d6owdNsiy74mKDNOY2vcmO0fmdMlE+ni0qpSNDoZhyZax7uHEWhLGtXwOj9+k+6Zh6clBsRZJP9UwLtRAVM7l44SjT2smvbnptS2JI482zn5zcyrmcZ6oXbDVYzWy+XbhMjV975XZlL7COZR9d2xUJPdeM5hJlI1KKnlD5nJVnKD1YwZ+f6bQIeel4WEJlV7H0H0TtgWRxD8w+fws2j3x8hVR3k5VJlEioai9jqC2OeCdbFFSaJmrCZ6aT20vVZE6gJk69UUd39cugkUaTVxG5I3AK/8WsxbUdkBsPhyPMxPBOD4YANU0cghvnh9XZP1rRUbSH2Td/YkbPQLOqkivoXkD26iFxLGoZJ0HXcBfO8I9hl0U5Qk15oRpuYDszJ6ZeRwFx9fWLFG8nP5gMOX6yvnQxinG40y36Cj5Uh/dfSb+TCsLZN9ddaXdZWhSfbMc1Mm5AcOPIrFtJG35hTYWJy9Ua5cac+yw6tWSdLN2IQhuzsXMMeCUKdarKnirA3VDox6jm9SFs/p0LB9Y0g7Eufyfj3oatEUcCWwppn1qIeJAo4MU9M0EN8Z/7CzFoRE0xCM2idauLw6IJbqEOxjyDcR6kvOkRAhAk3Qp33WHQqcaomKJkynbKp7WXJYuEUprCwssyq9pJcpbRAHqgaUWVn9vFpwRnFX1Ykh1lymXjiNFTiE2KjJlP8FmQkVbeY/VzpBm0vuA41AGyMBkBBdTMGRH5mI16m8zdS0Xd1aExfZbzKs0SHM0LP2l9fPDmkYdYNxmFjwzwCNRPJEQSB4FHr1GcAq847gn5IZgoQb1/aG775",
-                "sizes": "512x512",
-                "type": "image/png"
-            }
-        ]
-    };
-    
-    // Create and append manifest link
-    const manifestBlob = new Blob([JSON.stringify(manifest)], {type: 'application/json'});
-    const manifestURL = URL.createObjectURL(manifestBlob);
-    
-    // Remove existing manifest links
-    const existingManifest = document.querySelector('link[rel="manifest"]');
-    if (existingManifest) {
-        existingManifest.remove();
-    }
-    
-    const manifestLink = document.createElement('link');
-    manifestLink.rel = 'manifest';
-    manifestLink.href = manifestURL;
-    document.head.appendChild(manifestLink);
-    
-    // Add PWA meta tags
-    const metaTags = [
-        {name: 'viewport', content: 'width=device-width, initial-scale=1, maximum-scale=1, user-scalable=no'},
-        {name: 'apple-mobile-web-app-capable', content: 'yes'},
-        {name: 'apple-mobile-web-app-status-bar-style', content: 'default'},
-        {name: 'apple-mobile-web-app-title', content: 'KJ Academy'},
-        {name: 'mobile-web-app-capable', content: 'yes'},
-        {name: 'theme-color', content: '#1f77b4'},
-        {name: 'apple-touch-icon', content: manifest.icons[0].src}
-    ];
-    
-    metaTags.forEach(tag => {
-        const existingTag = document.querySelector(`meta[name="${tag.name}"]`);
-        if (existingTag) {
-            existingTag.remove();
-        }
-        const meta = document.createElement('meta');
-        meta.name = tag.name;
-        meta.content = tag.content;
-        document.head.appendChild(meta);
-    });
-    
-    // Register Service Worker
-    if ('serviceWorker' in navigator) {
-        const swCode = `
-            const CACHE_NAME = 'kj-badminton-v1';
-            const urlsToCache = [
-                '/',
-                window.location.href
-            ];
-            
-            self.addEventListener('install', function(event) {
-                event.waitUntil(
-                    caches.open(CACHE_NAME)
-                        .then(function(cache) {
-                            return cache.addAll(urlsToCache);
-                        })
-                );
-            });
-            
-            self.addEventListener('fetch', function(event) {
-                event.respondWith(
-                    caches.match(event.request)
-                        .then(function(response) {
-                            return response || fetch(event.request);
-                        }
-                    )
-                );
-            });
-            
-            self.addEventListener('activate', function(event) {
-                event.waitUntil(
-                    caches.keys().then(function(cacheNames) {
-                        return Promise.all(
-                            cacheNames.map(function(cacheName) {
-                                if (cacheName !== CACHE_NAME) {
-                                    return caches.delete(cacheName);
-                                }
-                            })
-                        );
-                    })
-                );
-            });
-        `;
-        
-        const swBlob = new Blob([swCode], {type: 'application/javascript'});
-        const swURL = URL.createObjectURL(swBlob);
-        
-        navigator.serviceWorker.register(swURL)
-            .then(function(registration) {
-                console.log('Service Worker registered successfully');
-            })
-            .catch(function(error) {
-                console.log('Service Worker registration failed');
-            });
-    }
-    
-    // Add install prompt functionality
-    let deferredPrompt;
-    window.addEventListener('beforeinstallprompt', (e) => {
-        e.preventDefault();
-        deferredPrompt = e;
-        
-        // Show install button if it exists
-        const installBtn = document.getElementById('install-btn');
-        if (installBtn) {
-            installBtn.style.display = 'block';
-            installBtn.addEventListener('click', () => {
-                deferredPrompt.prompt();
-                deferredPrompt.userChoice.then((choiceResult) => {
-                    deferredPrompt = null;
-                    installBtn.style.display = 'none';
-                });
-            });
-        }
-    });
-    </script>
-    """, unsafe_allow_html=True)
-    
-    # Custom CSS for mobile responsiveness
-    st.markdown("""
+# Names the service worker cache, so each deploy starts a fresh one and the activate
+# handler drops the old; defaults to a hash of this file when GIT_SHA is not set
+APP_VERSION = os.getenv("GIT_SHA")
+if not APP_VERSION:
+    with open(__file__, 'rb') as source_file:
+        APP_VERSION = hashlib.sha256(source_file.read()).hexdigest()[:12]
+
+# PWA bootstrap, minified with rjsmin from static/pwa.js; edit that readable source and
+# regenerate this constant (the service worker itself is served as static/sw.js)
+_PWA_JS_MIN = 'if(!window.__kjPwaInit){window.__kjPwaInit=true;const manifestURL=\'/app/static/manifest.json\';const existingManifest=document.querySelector(\'link[rel="manifest"]\');if(!existingManifest||existingManifest.getAttribute(\'href\')!==manifestURL){if(existingManifest){existingManifest.remove();}\nconst manifestLink=document.createElement(\'link\');manifestLink.rel=\'manifest\';manifestLink.href=manifestURL;document.head.appendChild(manifestLink);}\nconst metaTags=[{name:\'viewport\',content:\'width=device-width, initial-scale=1, maximum-scale=1, user-scalable=no\'},{name:\'apple-mobile-web-app-capable\',content:\'yes\'},{name:\'apple-mobile-web-app-status-bar-style\',content:\'default\'},{name:\'apple-mobile-web-app-title\',content:\'KJ Academy\'},{name:\'mobile-web-app-capable\',content:\'yes\'},{name:\'theme-color\',content:\'#1f77b4\'},{name:\'apple-touch-icon\',content:\'/app/static/icon-192x192.png\'}];metaTags.forEach(tag=>{const existingTag=document.querySelector(`meta[name="${tag.name}"]`);if(existingTag&&existingTag.content===tag.content){return;}\nif(existingTag){existingTag.remove();}\nconst meta=document.createElement(\'meta\');meta.name=tag.name;meta.content=tag.content;document.head.appendChild(meta);});if(\'serviceWorker\'in navigator){const swURL=\'/app/static/sw.js?v=__APP_VERSION__\';const registerServiceWorker=function(){navigator.serviceWorker.register(swURL,{scope:\'/\'}).catch(function(){});};if(document.readyState===\'complete\'){registerServiceWorker();}else{window.addEventListener(\'load\',registerServiceWorker);}}\nlet deferredPrompt;window.addEventListener(\'beforeinstallprompt\',(e)=>{e.preventDefault();deferredPrompt=e;const installBtn=document.getElementById(\'install-btn\');if(installBtn){installBtn.style.display=\'block\';installBtn.addEventListener(\'click\',()=>{deferredPrompt.prompt();deferredPrompt.userChoice.then((choiceResult)=>{deferredPrompt=null;installBtn.style.display=\'none\';});});}});}'
+
+# PWA configuration and meta tags, built once at import instead of on every rerun
+_PWA_SCRIPT_HTML = (
+    "<script>"
+    + _PWA_JS_MIN.replace('__APP_VERSION__', APP_VERSION)
+    + "</script>"
+)
+
+# Custom CSS for mobile responsiveness
+_MOBILE_CSS_HTML = """
     <style>
     .main .block-container {
         padding-top: 1rem;
@@ -1753,48 +1891,94 @@ def main():
         overflow-x: auto;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """
+
+# PWA script and mobile CSS combined, so the first run of a session emits a single element
+_HEAD_INJECT_HTML = _PWA_SCRIPT_HTML + _MOBILE_CSS_HTML
+
+# =============================================================================
+# MAIN APPLICATION
+# =============================================================================
+
+# Page name -> renderer, called with (db_manager, message_manager, reminder_scheduler)
+PAGE_HANDLERS = {
+    "Dashboard": lambda db, mm, rs: show_dashboard(db, rs),
+    "Member Registration": lambda db, mm, rs: show_member_registration(db),
+    "Payment Tracking": lambda db, mm, rs: show_payment_tracking(db),
+    "Kids Training": lambda db, mm, rs: show_kids_training(db),
+    "Send Reminders": lambda db, mm, rs: show_send_reminders(db, mm, rs),
+    "Bulk Messaging": lambda db, mm, rs: show_bulk_messaging(db, mm),
+    "Member Database": lambda db, mm, rs: show_member_database(db),
+    "Message Settings": lambda db, mm, rs: show_message_settings(db),
+    "Data Export": lambda db, mm, rs: show_data_export(db)
+}
+
+# How long an authenticated session skips check_authentication() between reruns
+AUTH_RECHECK_SECONDS = 60
+
+def main():
+    # Configure page ONCE at the very start - Streamlit requirement
+    st.set_page_config(
+        page_title="KJ Badminton Academy",
+        page_icon="🏸",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # Initialize session state defaults to ensure fresh sessions start unauthenticated
+    st.session_state.setdefault("authenticated", False)
+    st.session_state.setdefault("login_time", None)
+    st.session_state.setdefault("username", None)
+    
+    # Check authentication after page config; an authenticated session is re-checked at most
+    # once per AUTH_RECHECK_SECONDS, but a logout link always goes through the full check
+    now = time.time()
+    if (not st.session_state.authenticated
+            or now - st.session_state.get("_auth_checked_at", 0) > AUTH_RECHECK_SECONDS
+            or "logout" in st.query_params):
+        if not check_authentication():
+            show_login()
+            return
+        st.session_state["_auth_checked_at"] = now
+    
+    show_queued_toasts()
+    
+    # Initialize managers
+    db_manager = init_database()
+    message_manager = init_message_manager()
+    reminder_scheduler = init_reminder_scheduler()
+    
+    # One head element per rerun: the PWA script rides along only on the first run of a
+    # session (its DOM changes persist), while the mobile CSS goes out every rerun since
+    # Streamlit drops elements a rerun does not emit
+    if not st.session_state.get("_pwa_injected"):
+        st.markdown(_HEAD_INJECT_HTML, unsafe_allow_html=True)
+        st.session_state["_pwa_injected"] = True
+    else:
+        st.markdown(_MOBILE_CSS_HTML, unsafe_allow_html=True)
     
     st.title("🏸 KJ Badminton Academy")
     st.markdown("---")
     
-    # Sidebar navigation
+    # Sidebar user info and logout, below the page menu st.navigation adds
     with st.sidebar:
-        st.header("Navigation")
-        
-        # User info and logout
         if st.session_state.get("username"):
             st.success(f"👤 Logged in as: **{st.session_state.username}**")
             if st.button("🚪 Logout", use_container_width=True):
                 logout()
-        
-        st.markdown("---")
-        
-        page = st.selectbox(
-            "Select Page",
-            ["Dashboard", "Member Registration", "Payment Tracking", "Kids Training", 
-             "Send Reminders", "Bulk Messaging", "Member Database", "Message Settings", "Data Export"]
-        )
     
-    # Main content based on selected page
-    if page == "Dashboard":
-        show_dashboard(db_manager, reminder_scheduler)
-    elif page == "Member Registration":
-        show_member_registration(db_manager)
-    elif page == "Payment Tracking":
-        show_payment_tracking(db_manager)
-    elif page == "Kids Training":
-        show_kids_training(db_manager)
-    elif page == "Send Reminders":
-        show_send_reminders(db_manager, message_manager)
-    elif page == "Bulk Messaging":
-        show_bulk_messaging(db_manager, message_manager)
-    elif page == "Member Database":
-        show_member_database(db_manager)
-    elif page == "Message Settings":
-        show_message_settings(db_manager)
-    elif page == "Data Export":
-        show_data_export(db_manager)
+    # Main content: st.navigation lists the pages (in PAGE_HANDLERS order, the first being
+    # the default) at the top of the sidebar and runs only the selected one
+    pages = [
+        st.Page(
+            partial(handler, db_manager, message_manager, reminder_scheduler),
+            title=name,
+            url_path=name.lower().replace(" ", "-"),
+            default=(index == 0)
+        )
+        for index, (name, handler) in enumerate(PAGE_HANDLERS.items())
+    ]
+    st.navigation(pages).run()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
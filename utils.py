@@ -1,10 +1,41 @@
 import re
 from datetime import datetime, timedelta
 
+# Days until the next payment is due, per membership type (unknown types fall back to monthly)
+MEMBERSHIP_DURATION_DAYS = {
+    "Monthly Subscriber": 30,
+    "Quarterly": 90,
+    "Half Yearly": 180,
+    "Annual": 365
+}
+
+def next_due_date_sql(date_column="payment_date", type_column="membership_type"):
+    """SQLite expression for the next due date, built from MEMBERSHIP_DURATION_DAYS"""
+    whens = " ".join(
+        f"WHEN '{membership_type}' THEN '+{days} days'"
+        for membership_type, days in MEMBERSHIP_DURATION_DAYS.items()
+    )
+    return f"date({date_column}, CASE {type_column} {whens} ELSE '+30 days' END)"
+
+# Precompiled once; phone helpers run for every form submit and bulk import row
+_NON_DIGIT_RE = re.compile(r'\D')
+# Separators people usually type into phone numbers, stripped with a C-level table lookup
+_PHONE_SEPARATORS = str.maketrans('', '', '+ -().')
+
+def _phone_digits(phone):
+    """Strip all non-digit characters from a phone number"""
+    if phone.isdecimal():
+        return phone
+    digits = phone.translate(_PHONE_SEPARATORS)
+    if digits.isdecimal() or not digits:
+        return digits
+    # Anything unusual (letters, other punctuation) goes through the regex
+    return _NON_DIGIT_RE.sub('', digits)
+
 def format_phone_number(phone):
     """Format phone number to international format"""
     # Remove all non-digit characters
-    phone = re.sub(r'\D', '', phone)
+    phone = _phone_digits(phone)
     
     # If it starts with 91, assume it's already formatted
     if phone.startswith('91') and len(phone) == 12:
@@ -23,27 +54,15 @@ def format_phone_number(phone):
 def validate_phone_number(phone):
     """Validate phone number format"""
     # Remove all non-digit characters
-    digits_only = re.sub(r'\D', '', phone)
+    digits_only = _phone_digits(phone)
+    length = len(digits_only)
     
     # Check if it's a valid Indian mobile number
-    if len(digits_only) == 10:
-        return True
-    elif len(digits_only) == 12 and digits_only.startswith('91'):
-        return True
-    elif len(digits_only) == 13 and phone.startswith('+91'):
-        return True
-    
-    return False
+    return length == 10 or (length == 12 and digits_only.startswith('91')) or (length == 13 and phone.startswith('+91'))
 
 def calculate_membership_duration(membership_type):
     """Calculate duration in days for different membership types"""
-    duration_map = {
-        "Monthly Subscriber": 30,
-        "Quarterly": 90,
-        "Half Yearly": 180,
-        "Annual": 365
-    }
-    return duration_map.get(membership_type, 30)
+    return MEMBERSHIP_DURATION_DAYS.get(membership_type, 30)
 
 def format_currency(amount):
     """Format amount in Indian Rupees"""